@@ -1,9 +1,11 @@
 from pathlib import Path
+from typing import Optional
 import pandas as pd
 import numpy as np
 import sys
 import os
 import argparse
+import functools
 
 proj_root = Path(__file__).resolve().parent.parent
 if str(proj_root) not in sys.path:
@@ -13,6 +15,28 @@ CSV = proj_root / "option_paper_backtest_scaleout.csv"
 PNL_COL = "opt_net_total_pnl_rupees_2lots"
 
 
+def _read_csv(path):
+    # pyarrow's multithreaded CSV reader when available; stock parser otherwise
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except (ImportError, ValueError):
+        return pd.read_csv(path)
+
+
+def _write_csv(df, path) -> None:
+    # pyarrow's multithreaded C++ CSV writer when available; stock writer otherwise
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df.to_csv(path, index=False)
+        return
+    try:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+    except pa.ArrowInvalid:
+        df.to_csv(path, index=False)
+
+
 def _parse_profile_arg(default: str = "NIFTY") -> str:
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument("--profile", choices=["nifty", "banknifty"])
@@ -29,68 +53,60 @@ def apply_strategy_profile(profile: str) -> None:
         CSV = proj_root / "option_paper_backtest_scaleout.csv"
 
 def parse_dt_col(df: pd.DataFrame, col: str):
+    # Backtest CSVs write ISO timestamps; the format hint skips dateutil
+    # per-row inference and cache=True dedupes repeated session dates.
     if col in df.columns:
-        df[col] = pd.to_datetime(df[col], errors="coerce")
+        df[col] = pd.to_datetime(df[col], format="ISO8601", cache=True, errors="coerce")
     return df
 
-def ist_time_parts(ts):
-    if pd.isna(ts):
-        return None, None
-    if getattr(ts, "tzinfo", None) is not None:
-        ts = ts.tz_convert("Asia/Kolkata")
-    return ts.hour, ts.minute
-
+@functools.lru_cache(maxsize=None)
 def hhmm_to_str(hhmm: int) -> str:
+    # pure function on a tiny domain (session hhmm values), so memoize
     h = hhmm // 100
     m = hhmm % 100
     return f"{h:02d}:{m:02d}"
 
 def add_time_features(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
-    hours = []
-    mins = []
-    hhmm_vals = []
-    for ts in df["entry_time"]:
-        hm = ist_time_parts(ts)
-        if hm == (None, None):
-            hours.append(np.nan)
-            mins.append(np.nan)
-            hhmm_vals.append(np.nan)
-        else:
-            h, m = hm
-            hours.append(h)
-            mins.append(m)
-            hhmm_vals.append(h * 100 + m)
-    df["entry_hour"] = hours
-    df["entry_minute"] = mins
-    df["entry_hhmm"] = hhmm_vals
+    s = df["entry_time"]
+    # tz check once for the whole column instead of per row
+    if s.dt.tz is not None:
+        s = s.dt.tz_convert("Asia/Kolkata")
+    h = s.dt.hour
+    m = s.dt.minute
+    df["entry_hour"] = h
+    df["entry_minute"] = m
+    df["entry_hhmm"] = (h * 100 + m).astype("Int64")
     return df
 
-def summarize(df: pd.DataFrame, name: str) -> dict:
-    if df.empty:
-        return {
-            "variant": name,
-            "trades": 0,
-            "wins": 0,
-            "losses": 0,
-            "win_rate_%": 0.0,
-            "net_pnl": 0.0,
-            "avg_pnl": 0.0,
-            "median_pnl": 0.0,
-            "avg_win": np.nan,
-            "avg_loss": np.nan,
-            "max_win": np.nan,
-            "max_loss": np.nan,
-            "profit_factor": np.nan,
-        }
-
-    pnl = df[PNL_COL].astype(float)
+# template for variants with no rows (or no usable columns at all)
+_EMPTY_SUMMARY = {
+    "trades": 0,
+    "wins": 0,
+    "losses": 0,
+    "win_rate_%": 0.0,
+    "net_pnl": 0.0,
+    "avg_pnl": 0.0,
+    "median_pnl": 0.0,
+    "avg_win": np.nan,
+    "avg_loss": np.nan,
+    "max_win": np.nan,
+    "max_loss": np.nan,
+    "profit_factor": np.nan,
+}
+
+def summarize(pnl: Optional[np.ndarray], name: str) -> dict:
+    # None marks a degenerate variant (required columns missing) — skip
+    # even the empty-slice allocation and reuse the shared template
+    if pnl is None or pnl.size == 0:
+        return {"variant": name, **_EMPTY_SUMMARY}
+
     wins_mask = pnl > 0
     losses_mask = ~wins_mask
 
     wins = int(wins_mask.sum())
     losses = int(losses_mask.sum())
-    trades = len(df)
+    trades = int(pnl.size)
 
     gross_profit = pnl[wins_mask].sum()
     gross_loss_abs = abs(pnl[losses_mask].sum())
@@ -105,41 +121,52 @@ def summarize(df: pd.DataFrame, name: str) -> dict:
         "wins": wins,
         "losses": losses,
         "win_rate_%": round(float((wins / trades) * 100), 2) if trades else 0.0,
-        "net_pnl": round(float(pnl.sum()), 2), # type: ignore
-        "avg_pnl": round(float(pnl.mean()), 2), # type: ignore
-        "median_pnl": round(float(pnl.median()), 2), # type: ignore
-        "avg_win": round(float(pnl[wins_mask].mean()), 2) if wins > 0 else np.nan, # type: ignore
-        "avg_loss": round(float(pnl[losses_mask].mean()), 2) if losses > 0 else np.nan, # type: ignore
-        "max_win": round(float(pnl.max()), 2), # type: ignore
-        "max_loss": round(float(pnl.min()), 2), # type: ignore
+        "net_pnl": round(float(pnl.sum()), 2),
+        "avg_pnl": round(float(pnl.mean()), 2),
+        "median_pnl": round(float(np.median(pnl)), 2),
+        "avg_win": round(float(pnl[wins_mask].mean()), 2) if wins > 0 else np.nan,
+        "avg_loss": round(float(pnl[losses_mask].mean()), 2) if losses > 0 else np.nan,
+        "max_win": round(float(pnl.max()), 2),
+        "max_loss": round(float(pnl.min()), 2),
         "profit_factor": round(float(pf), 2) if pd.notna(pf) else np.nan,
     }
 
-def apply_cutoff(df: pd.DataFrame, cutoff_hhmm: int) -> pd.DataFrame:
-    # keep entries <= cutoff
-    return df[df["entry_hhmm"] <= cutoff_hhmm].copy()
+def cutoff_mask(df: pd.DataFrame, cutoff_hhmm: int) -> np.ndarray:
+    # keep entries <= cutoff (NA entry times drop out, same as before)
+    return df["entry_hhmm"].le(cutoff_hhmm).fillna(False).to_numpy()
+
+def normalize_filter_cols(df: pd.DataFrame) -> pd.DataFrame:
+    # Upper-case side/level_name once and store as categoricals so every
+    # variant filter compares integer codes, not repeated str.upper passes.
+    for c in ("side", "level_name"):
+        if c in df.columns:
+            df[c] = df[c].astype(str).str.upper().astype("category")
+    # exit reasons are low-cardinality too; category codes instead of one
+    # Python string object per row
+    for c in ("lot1_exit_reason", "lot2_exit_reason"):
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    return df
 
-def exclude_short_s2(df: pd.DataFrame) -> pd.DataFrame:
+def exclude_short_s2_mask(df: pd.DataFrame) -> np.ndarray:
     if not {"side", "level_name"}.issubset(df.columns):
-        return df.copy()
-    mask = ~((df["side"].astype(str).str.upper() == "SHORT") & (df["level_name"].astype(str).str.upper() == "S2"))
-    return df[mask].copy()
+        return np.ones(len(df), dtype=bool)
+    return ~(df["side"].eq("SHORT") & df["level_name"].eq("S2")).to_numpy()
 
-def only_short_s1(df: pd.DataFrame) -> pd.DataFrame:
+def only_short_s1_mask(df: pd.DataFrame) -> Optional[np.ndarray]:
     if not {"side", "level_name"}.issubset(df.columns):
-        return df.iloc[0:0].copy()
-    mask = (df["side"].astype(str).str.upper() == "SHORT") & (df["level_name"].astype(str).str.upper() == "S1")
-    return df[mask].copy()
+        return None
+    return (df["side"].eq("SHORT") & df["level_name"].eq("S1")).to_numpy()
 
-def only_longs(df: pd.DataFrame) -> pd.DataFrame:
+def only_longs_mask(df: pd.DataFrame) -> Optional[np.ndarray]:
     if "side" not in df.columns:
-        return df.iloc[0:0].copy()
-    return df[df["side"].astype(str).str.upper() == "LONG"].copy()
+        return None
+    return df["side"].eq("LONG").to_numpy()
 
-def only_shorts(df: pd.DataFrame) -> pd.DataFrame:
+def only_shorts_mask(df: pd.DataFrame) -> Optional[np.ndarray]:
     if "side" not in df.columns:
-        return df.iloc[0:0].copy()
-    return df[df["side"].astype(str).str.upper() == "SHORT"].copy()
+        return None
+    return df["side"].eq("SHORT").to_numpy()
 
 def print_variant_detail(df: pd.DataFrame, name: str, max_rows: int = 10):
     print(f"\n--- {name} (sample rows) ---")
@@ -161,7 +188,7 @@ def main():
     if not CSV.exists():
         raise RuntimeError(f"File not found: {CSV}")
 
-    df = pd.read_csv(CSV)
+    df = _read_csv(CSV)
     df = parse_dt_col(df, "entry_time")
 
     if PNL_COL not in df.columns:
@@ -171,35 +198,45 @@ def main():
         df = df[df["opt_error"].isna()].copy()
 
     df = add_time_features(df)
+    df = normalize_filter_cols(df)
+
+    # Build variants as boolean masks over the base frame; the summary pass
+    # then reduces slices of one shared PnL array instead of materializing a
+    # filtered DataFrame per variant.
+    pnl_arr = df[PNL_COL].to_numpy(dtype=float)
+    cutoffs = {c: cutoff_mask(df, c) for c in [1400, 1415, 1430]}
+    no_short_s2 = exclude_short_s2_mask(df)
+    short_s1 = only_short_s1_mask(df)
 
-    # Build variants
     variants = []
 
     # Baseline
-    variants.append(("Baseline", df.copy()))
+    variants.append(("Baseline", np.ones(len(df), dtype=bool)))
 
     # Time cutoffs only
     for cutoff in [1400, 1415, 1430]:
-        variants.append((f"Cutoff <= {hhmm_to_str(cutoff)}", apply_cutoff(df, cutoff)))
+        variants.append((f"Cutoff <= {hhmm_to_str(cutoff)}", cutoffs[cutoff]))
 
     # Filter only
-    variants.append(("Exclude SHORT S2", exclude_short_s2(df)))
-    variants.append(("Only SHORT S1", only_short_s1(df)))
-    variants.append(("Only SHORTs", only_shorts(df)))
-    variants.append(("Only LONGs", only_longs(df)))
+    variants.append(("Exclude SHORT S2", no_short_s2))
+    variants.append(("Only SHORT S1", short_s1))
+    variants.append(("Only SHORTs", only_shorts_mask(df)))
+    variants.append(("Only LONGs", only_longs_mask(df)))
 
     # Combined filters
-    base_no_s2 = exclude_short_s2(df)
     for cutoff in [1400, 1415, 1430]:
-        variants.append((f"Exclude SHORT S2 + Cutoff <= {hhmm_to_str(cutoff)}", apply_cutoff(base_no_s2, cutoff)))
+        variants.append((f"Exclude SHORT S2 + Cutoff <= {hhmm_to_str(cutoff)}", no_short_s2 & cutoffs[cutoff]))
 
     # S1-focused cutoff variants
-    short_s1 = only_short_s1(df)
     for cutoff in [1400, 1415, 1430]:
-        variants.append((f"Only SHORT S1 + Cutoff <= {hhmm_to_str(cutoff)}", apply_cutoff(short_s1, cutoff)))
+        combined = None if short_s1 is None else short_s1 & cutoffs[cutoff]
+        variants.append((f"Only SHORT S1 + Cutoff <= {hhmm_to_str(cutoff)}", combined))
 
     # Summaries
-    summary_rows = [summarize(vdf, name) for name, vdf in variants]
+    summary_rows = [
+        summarize(pnl_arr[mask] if mask is not None else None, name)
+        for name, mask in variants
+    ]
     summary_df = pd.DataFrame(summary_rows)
 
     # Sort by net pnl then profit factor then trades
@@ -213,15 +250,17 @@ def main():
 
     # Save summary
     out_path = CSV.parent / "report_filtered_variants.csv"
-    summary_df.to_csv(out_path, index=False)
+    _write_csv(summary_df, out_path)
     print(f"\nSaved: {out_path}")
 
     # Also save top 3 variant trade lists for inspection
     top3 = summary_df.head(3)["variant"].tolist()
-    name_to_df = {name: vdf for name, vdf in variants}
+    name_to_mask = dict(variants)
 
     for i, name in enumerate(top3, start=1):
-        vdf = name_to_df[name].copy()
+        # realize the filtered frame only for the variants we actually save
+        mask = name_to_mask[name]
+        vdf = df[mask] if mask is not None else df.iloc[0:0]
         safe_name = (
             name.replace(" ", "_")
                 .replace(":", "")
@@ -230,7 +269,7 @@ def main():
                 .replace("/", "_")
         )
         detail_path = CSV.parent / f"top_variant_{i}_{safe_name}.csv"
-        vdf.to_csv(detail_path, index=False)
+        _write_csv(vdf, detail_path)
         print(f"Saved top variant trades: {detail_path}")
         print_variant_detail(vdf, name)
 
@@ -6,12 +6,35 @@ import argparse
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 proj_root = Path(__file__).resolve().parent.parent
 CSV_PATH = proj_root / "option_paper_backtest_scaleout.csv"
 
 
+def _read_csv(path):
+    # pyarrow's multithreaded CSV reader when available; stock parser otherwise
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except (ImportError, ValueError):
+        return pd.read_csv(path)
+
+
+def _write_csv(df, path) -> None:
+    # pyarrow's multithreaded C++ CSV writer when available; stock writer otherwise
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df.to_csv(path, index=False)
+        return
+    try:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+    except pa.ArrowInvalid:
+        df.to_csv(path, index=False)
+
+
 def _parse_profile_arg(default: str = "NIFTY") -> str:
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument("--profile", choices=["nifty", "banknifty"])
@@ -50,6 +73,81 @@ def detect_time_column(df: pd.DataFrame) -> Optional[str]:
     return None
 
 
+def add_time_bucket(df: pd.DataFrame, time_col: str) -> pd.DataFrame:
+    """
+    Bucket entries into session windows with one pd.cut over an integer
+    hhmm array — no per-row Python function or tzinfo re-checks.
+    """
+    s = df[time_col]
+    if s.dt.tz is not None:
+        s = s.dt.tz_convert("Asia/Kolkata")
+    hhmm = s.dt.hour.to_numpy() * 100 + s.dt.minute.to_numpy()
+    bucket = pd.cut(
+        hhmm,
+        bins=[-1, 1100, 1300, 1430, 2400],
+        labels=["09:15-11:00", "11:00-13:00", "13:00-14:30", "14:30-15:30"],
+    )
+    df["time_bucket"] = (
+        pd.Series(bucket, index=df.index)
+        .cat.add_categories("UNKNOWN")
+        .fillna("UNKNOWN")
+    )
+    return df
+
+
+def summarize_by(df: pd.DataFrame, pnl_col: str, by: list) -> Optional[pd.DataFrame]:
+    """
+    Grouped performance stats computed with vectorized aggregations only —
+    gross profit/loss come from masked sum columns, derived metrics from
+    array ops on the grouped frame (no per-group Python lambdas).
+    """
+    cols = [c for c in by if c in df.columns]
+    if len(cols) != len(by):
+        return None
+
+    pnl = df[pnl_col]
+    tmp = df[cols].copy()
+    tmp["_pnl"] = pnl
+    tmp["_pos"] = pnl.where(pnl > 0, 0.0)
+    tmp["_neg"] = pnl.where(pnl <= 0, 0.0)
+    tmp["_is_win"] = (pnl > 0).astype(int)
+
+    out = tmp.groupby(cols, observed=True).agg(
+        trades=("_pnl", "count"),
+        wins=("_is_win", "sum"),
+        net_pnl=("_pnl", "sum"),
+        avg_pnl=("_pnl", "mean"),
+        median_pnl=("_pnl", "median"),
+        max_win=("_pnl", "max"),
+        max_loss=("_pnl", "min"),
+        gross_profit=("_pos", "sum"),
+        gross_loss=("_neg", "sum"),
+    )
+
+    trades = out["trades"].to_numpy()
+    wins = out["wins"].to_numpy()
+    losses = trades - wins
+    gp = out["gross_profit"].to_numpy()
+    gl = out["gross_loss"].to_numpy()
+
+    out["losses"] = losses
+    out["win_rate_%"] = np.where(trades > 0, wins / np.maximum(trades, 1) * 100.0, 0.0)
+    out["avg_win"] = np.where(wins > 0, gp / np.maximum(wins, 1), np.nan)
+    out["avg_loss"] = np.where(losses > 0, gl / np.maximum(losses, 1), np.nan)
+    # guarded divide: groups with no losing trades get NaN without ever
+    # evaluating gp/0 (np.where would still compute both branches)
+    out["profit_factor"] = np.divide(
+        gp, np.abs(gl), out=np.full_like(gp, np.nan, dtype=float), where=gl < 0
+    )
+
+    out = out.drop(columns=["gross_profit", "gross_loss"])
+    col_order = [
+        "trades", "wins", "losses", "win_rate_%", "net_pnl", "avg_pnl",
+        "median_pnl", "avg_win", "avg_loss", "max_win", "max_loss", "profit_factor",
+    ]
+    return out[col_order].round(2)
+
+
 def main():
     profile = _parse_profile_arg()
     apply_strategy_profile(profile)
@@ -57,7 +155,7 @@ def main():
     if not os.path.exists(CSV_PATH):
         raise RuntimeError(f"CSV not found: {CSV_PATH}")
 
-    df = pd.read_csv(CSV_PATH)
+    df = _read_csv(CSV_PATH)
 
     print("Loaded rows:", len(df))
     print("Columns:", list(df.columns))
@@ -95,10 +193,18 @@ def main():
             "Check upstream option mapping/backtest output."
         )
 
+    # low-cardinality string columns as categoricals: groupby keys become
+    # int8 codes and each distinct string is stored once
+    for c in ("side", "level_name", "lot1_exit_reason", "lot2_exit_reason"):
+        if c in valid.columns:
+            valid[c] = valid[c].astype("category")
+
     time_col = detect_time_column(valid)
     if time_col and time_col in valid.columns:
-        valid[time_col] = pd.to_datetime(valid[time_col], errors="coerce")
+        # backtest CSVs emit ISO timestamps; format hint avoids dateutil fallback
+        valid[time_col] = pd.to_datetime(valid[time_col], format="ISO8601", cache=True, errors="coerce")
         valid = valid.sort_values(time_col).reset_index(drop=True)
+        valid = add_time_bucket(valid, time_col)
 
     pnl = valid[pnl_col]
 
@@ -121,12 +227,22 @@ def main():
     print(f"Worst trade        : Rs {pnl.min():,.2f}")
     print(f"Max Drawdown       : Rs {valid['drawdown'].min():,.2f}")
 
+    for title, by in (
+        ("BY SIDE", ["side"]),
+        ("BY SIDE + LEVEL", ["side", "level_name"]),
+        ("BY TIME BUCKET", ["time_bucket"]),
+    ):
+        breakdown = summarize_by(valid, pnl_col, by)
+        if breakdown is not None and not breakdown.empty:
+            print(f"\n===== {title} =====")
+            print(breakdown.to_string())
+
     preview_cols = [c for c in ["entry_time", "opt_entry_time", "side", "opt_symbol", pnl_col, "opt_error"] if c in valid.columns]
     print("\nRecent valid trades:")
     print(valid[preview_cols].tail(10).to_string(index=False))
 
     analyzed_path = os.path.splitext(CSV_PATH)[0] + "_analyzed.csv"
-    valid.to_csv(analyzed_path, index=False)
+    _write_csv(valid, analyzed_path)
     print(f"\nSaved analyzed file to: {analyzed_path}")
 
 
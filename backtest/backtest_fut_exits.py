@@ -6,14 +6,60 @@ proj_root = Path(__file__).resolve().parent.parent
 if str(proj_root) not in sys.path:
     sys.path.insert(0, str(proj_root))
 
-from dataclasses import asdict
+import numpy as np
 import pandas as pd
 from core.signal_engine import generate_signals, prepare_df
 
 CSV = proj_root / "nifty_fut_5m.csv"
 OUT = proj_root / "fut_backtest_results.csv"
 
-def simulate_exit(df: pd.DataFrame, signal):
+def _read_csv(path):
+    # pyarrow's multithreaded CSV reader when available; stock parser otherwise
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except (ImportError, ValueError):
+        return pd.read_csv(path)
+
+
+def _write_csv(df, path) -> None:
+    # pyarrow's multithreaded C++ CSV writer when available; stock writer otherwise
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df.to_csv(path, index=False)
+        return
+    try:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+    except pa.ArrowInvalid:
+        df.to_csv(path, index=False)
+
+
+def build_day_bounds(df: pd.DataFrame) -> dict:
+    """
+    Map each trading day to its [start, end) positional range in the
+    prepared frame (sorted DatetimeIndex), so per-signal scans can slice
+    directly instead of re-deriving index.date for the whole frame.
+    """
+    dates = np.asarray(df.index.date)
+    starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+    ends = np.r_[starts[1:], len(dates)]
+    return {dates[s]: (int(s), int(e)) for s, e in zip(starts, ends)}
+
+def build_market_arrays(df: pd.DataFrame):
+    """
+    Pull the columns the simulator actually reads out of the prepared frame
+    once (timestamps + high/low/close), so per-signal scans slice NumPy
+    arrays instead of copying DataFrame rows.
+    """
+    return (
+        df.index,
+        df["high"].to_numpy(dtype=float),
+        df["low"].to_numpy(dtype=float),
+        df["close"].to_numpy(dtype=float),
+    )
+
+def simulate_exit(df: pd.DataFrame, signal, day_bounds: dict | None = None, arrays=None):
     """
     Simulate exits on FUT candles after entry:
     - LONG: TP if high >= tp, SL if low <= sl
@@ -30,10 +76,18 @@ def simulate_exit(df: pd.DataFrame, signal):
     trade_date = pd.Timestamp(entry_time).date()
 
     # Start checking from entry candle itself (entry is at open of this candle)
-    scan = df.iloc[entry_idx:].copy()
-    scan = scan[scan.index.date == trade_date]
-
-    if scan.empty:
+    if day_bounds is not None:
+        start, end = day_bounds.get(trade_date, (entry_idx, entry_idx))
+        s0, e0 = max(entry_idx, start), end
+    else:
+        dates = np.asarray(df.index.date)
+        same = np.flatnonzero(dates[entry_idx:] == trade_date)
+        if same.size:
+            s0, e0 = entry_idx + int(same[0]), entry_idx + int(same[-1]) + 1
+        else:
+            s0 = e0 = entry_idx
+
+    if s0 >= e0:
         return {
             "exit_time": None,
             "exit_price": None,
@@ -42,75 +96,49 @@ def simulate_exit(df: pd.DataFrame, signal):
             "win": None,
         }
 
-    for ts, row in scan.iterrows():
-        high_ = float(row["high"])
-        low_ = float(row["low"])
-        close_ = float(row["close"])
+    if arrays is None:
+        arrays = build_market_arrays(df)
+    times, high_all, low_all, close_all = arrays
+    high = high_all[s0:e0]
+    low = low_all[s0:e0]
 
+    if side in ("LONG", "SHORT"):
         if side == "LONG":
-            hit_tp = high_ >= tp
-            hit_sl = low_ <= sl
-
-            if hit_tp and hit_sl:
-                # conservative: assume SL first
-                return {
-                    "exit_time": ts,
-                    "exit_price": sl,
-                    "exit_reason": "SL_SAME_CANDLE",
-                    "pnl_points": sl - signal.entry,
-                    "win": 0,
-                }
-            elif hit_sl:
+            hit_tp = high >= tp
+            hit_sl = low <= sl
+        else:
+            hit_tp = low <= tp
+            hit_sl = high >= sl
+
+        any_hit = hit_tp | hit_sl
+        if any_hit.any():
+            # np.argmax on a boolean mask gives the first True -> exit candle
+            i = int(np.argmax(any_hit))
+            ts = times[s0 + i]
+
+            if hit_sl[i]:
+                # conservative: if both hit in same candle, assume SL first
+                pnl = (sl - signal.entry) if side == "LONG" else (signal.entry - sl)
                 return {
                     "exit_time": ts,
                     "exit_price": sl,
-                    "exit_reason": "SL",
-                    "pnl_points": sl - signal.entry,
+                    "exit_reason": "SL_SAME_CANDLE" if hit_tp[i] else "SL",
+                    "pnl_points": pnl,
                     "win": 0,
                 }
-            elif hit_tp:
-                return {
-                    "exit_time": ts,
-                    "exit_price": tp,
-                    "exit_reason": "TP",
-                    "pnl_points": tp - signal.entry,
-                    "win": 1,
-                }
 
-        elif side == "SHORT":
-            hit_tp = low_ <= tp
-            hit_sl = high_ >= sl
-
-            if hit_tp and hit_sl:
-                # conservative: assume SL first
-                return {
-                    "exit_time": ts,
-                    "exit_price": sl,
-                    "exit_reason": "SL_SAME_CANDLE",
-                    "pnl_points": signal.entry - sl,
-                    "win": 0,
-                }
-            elif hit_sl:
-                return {
-                    "exit_time": ts,
-                    "exit_price": sl,
-                    "exit_reason": "SL",
-                    "pnl_points": signal.entry - sl,
-                    "win": 0,
-                }
-            elif hit_tp:
-                return {
-                    "exit_time": ts,
-                    "exit_price": tp,
-                    "exit_reason": "TP",
-                    "pnl_points": signal.entry - tp,
-                    "win": 1,
-                }
+            pnl = (tp - signal.entry) if side == "LONG" else (signal.entry - tp)
+            return {
+                "exit_time": ts,
+                "exit_price": tp,
+                "exit_reason": "TP",
+                "pnl_points": pnl,
+                "win": 1,
+            }
 
     # Day-end fallback (last available candle of same day)
-    last_row = scan.iloc[-1]
-    eod_close = float(last_row["close"])
-    ts = scan.index[-1]
+    eod_close = float(close_all[e0 - 1])
+    ts = times[e0 - 1]
 
     if side == "LONG":
         pnl = eod_close - signal.entry
@@ -129,8 +157,8 @@ def main():
     if not CSV.exists():
         raise RuntimeError("nifty_fut_5m.csv not found. Run fetch_candles.py first.")
 
-    df = pd.read_csv(CSV)
-    df["date"] = pd.to_datetime(df["date"])
+    df = _read_csv(CSV)
+    df["date"] = pd.to_datetime(df["date"], format="ISO8601", cache=True)
 
     # Use prepared df so index positions match generate_signals internals
     prepared = prepare_df(df)
@@ -140,10 +168,13 @@ def main():
         print("No signals found.")
         return
 
+    day_bounds = build_day_bounds(prepared)
+    arrays = build_market_arrays(prepared)
+
     rows = []
     for s in signals:
-        exit_info = simulate_exit(prepared, s)
-        row = asdict(s)
+        exit_info = simulate_exit(prepared, s, day_bounds, arrays)
+        row = s.to_dict()
         row.update(exit_info)
 
         # RR metrics
@@ -155,7 +186,7 @@ def main():
         rows.append(row)
 
     res = pd.DataFrame(rows)
-    res.to_csv(OUT, index=False)
+    _write_csv(res, OUT)
 
     # summary
     total = len(res)
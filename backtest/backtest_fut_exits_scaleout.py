@@ -12,11 +12,17 @@ proj_root = Path(__file__).resolve().parent.parent
 if str(proj_root) not in sys.path:
     sys.path.insert(0, str(proj_root))
 
-from dataclasses import asdict, is_dataclass
-from typing import Any, Dict, List, Optional
+from dataclasses import is_dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except Exception:
+    njit = None  # optional speedup; the kernel also runs as plain Python
+
 TARGET1_POINTS = 40.0
 PRINT_PREVIEW_ROWS = 10
 OUTPUT_CSV = proj_root / "fut_backtest_scaleout_results.csv"
@@ -29,6 +35,20 @@ MAX_CANDLE_RANGE_POINTS = None
 MAX_SL_DISTANCE_POINTS = None
 
 
+
+def _write_csv(df, path) -> None:
+    # pyarrow's multithreaded C++ CSV writer when available; stock writer otherwise
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df.to_csv(path, index=False)
+        return
+    try:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+    except pa.ArrowInvalid:
+        df.to_csv(path, index=False)
+
 def _parse_profile_arg(default: str = "NIFTY") -> str:
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument("--profile", choices=["nifty", "banknifty"])
@@ -37,6 +57,17 @@ def _parse_profile_arg(default: str = "NIFTY") -> str:
     return "BANKNIFTY" if "BANK" in val else "NIFTY"
 
 
+def _parse_jobs_arg(default: int = 1) -> int:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--jobs", type=int)
+    args, _ = parser.parse_known_args()
+    try:
+        jobs = args.jobs if args.jobs is not None else int(os.getenv("BACKTEST_JOBS", default))
+    except ValueError:
+        jobs = default
+    return max(1, jobs)
+
+
 def apply_strategy_profile(profile: str) -> None:
     global TARGET1_POINTS, OUTPUT_CSV, ALLOW_LONG_PP_SIGNAL, ALLOW_SHORT_PP_SIGNAL
     global MIN_BODY_POINTS, SIGNAL_ENTRY_CUTOFF_HHMM, PP_ENTRY_CUTOFF_HHMM
@@ -79,7 +110,8 @@ def _sig_get(signal, *names):
             if name in signal and signal[name] is not None:
                 return signal[name]
     if is_dataclass(signal):
-        d = asdict(signal)
+        # shallow field lookup; asdict would deep-copy every field per call
+        d = vars(signal)
         for name in names:
             if name in d and d[name] is not None:
                 return d[name]
@@ -165,7 +197,7 @@ def _ensure_df(prepared: Any) -> pd.DataFrame:
                 if isinstance(r, dict):
                     rows.append(r)
                 elif is_dataclass(r):
-                    rows.append(asdict(r))
+                    rows.append(vars(r))
                 elif hasattr(r, "__dict__"):
                     rows.append(vars(r))
                 else:
@@ -265,100 +297,155 @@ def _detect_time_col(df: pd.DataFrame) -> str:
     raise KeyError(f"No time column found in prepared candles. Tried names {TIME_COL_CANDIDATES}. Columns present: {list(df.columns)}")
 
 
-def simulate_scaleout_trade(prepared_df: pd.DataFrame, signal, target1_points: float = TARGET1_POINTS) -> Dict[str, Any]:
-    side = sig_side(signal)
-    entry_price = sig_entry(signal)
-    sl_price = sig_sl(signal)
-    signal_ts = pd.to_datetime(sig_time(signal), errors="coerce")
-
-    if pd.isna(signal_ts):
-        raise ValueError("Invalid signal time")
-    if side not in {"LONG", "SHORT"}:
-        raise ValueError(f"Unsupported side: {side}")
+def _detect_col(df: pd.DataFrame, candidates: List[str]) -> str:
+    for c in candidates:
+        if c in df.columns:
+            return c
+    raise KeyError(f"Missing column. Tried: {candidates}. Columns present: {list(df.columns)}")
 
-    t1_price = entry_price + target1_points if side == "LONG" else entry_price - target1_points
 
+def build_day_slices(prepared_df: pd.DataFrame) -> Dict[Any, Tuple[pd.Series, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Parse/sort the prepared candles once and group them by trading day.
+    Returns {date: (times, high, low, close)} where the OHLC legs are
+    float arrays, so each signal only has to slice its own day instead of
+    re-parsing and re-filtering the full frame.
+    """
     df = prepared_df.copy()
     time_col = _detect_time_col(df)
-
     df[time_col] = pd.to_datetime(df[time_col], errors="coerce")
     df = df.dropna(subset=[time_col]).sort_values(time_col).reset_index(drop=True)
 
-    trade_df = df[(df[time_col].dt.date == signal_ts.date()) & (df[time_col] >= signal_ts)].copy().reset_index(drop=True)
-    if trade_df.empty:
-        return {
-            "entry_time": signal_ts, "side": side, "entry_price": entry_price, "sl_price": sl_price,
-            "t1_price": t1_price, "status": "NO_CANDLES_AFTER_SIGNAL", "error": "No candles after signal timestamp",
-            "realized_points_total": 0.0, "exit1_time": None, "exit1_price": None, "exit2_time": None, "exit2_price": None
-        }
+    high_col = _detect_col(df, HIGH_COL_CANDIDATES)
+    low_col = _detect_col(df, LOW_COL_CANDIDATES)
+    close_col = _detect_col(df, CLOSE_COL_CANDIDATES)
+
+    slices = {}
+    for day, g in df.groupby(df[time_col].dt.date, sort=False):
+        slices[day] = (
+            g[time_col].reset_index(drop=True),
+            g[high_col].to_numpy(dtype=float),
+            g[low_col].to_numpy(dtype=float),
+            g[close_col].to_numpy(dtype=float),
+        )
+    return slices
 
-    half_qty, rem_qty = 0.5, 0.5
-    t1_hit = False
-    exit1_time = exit1_price = exit2_time = exit2_price = None
-    realized_points_total = 0.0
-    status = "OPEN"
 
-    def points_from_move(exit_px: float) -> float:
-        return (exit_px - entry_price) if side == "LONG" else (entry_price - exit_px)
+# Scan status codes returned by _scan_scaleout (index into _SCAN_STATUS)
+_SCAN_STATUS = ("SL_HIT_AMBIGUOUS_BEFORE_T1", "SL_HIT", "T1_THEN_BE", "OPEN")
 
-    for _, row in trade_df.iterrows():
-        t = row[time_col]
-        h = row_high(row)
-        l = row_low(row)
+
+def _scan_scaleout(high, low, side_code, entry_price, sl_price, t1_price):
+    """
+    Candle-by-candle scale-out scan on raw float arrays.
+
+    side_code: +1 for LONG, -1 for SHORT. Returns
+    (status_code, exit1_idx, exit1_price, exit2_idx, exit2_price,
+     realized_points_total, t1_hit) with -1 for "no exit yet" indices.
+    Numeric-only so Numba can JIT it when installed.
+    """
+    n = high.shape[0]
+    t1_hit = False
+    i1 = -1
+    p1 = 0.0
+    i2 = -1
+    p2 = 0.0
+    realized = 0.0
+
+    for i in range(n):
+        h = high[i]
+        l = low[i]
 
         if not t1_hit:
-            if side == "LONG":
+            if side_code == 1:
                 sl_hit = l <= sl_price
                 t1_reached = h >= t1_price
             else:
                 sl_hit = h >= sl_price
                 t1_reached = l <= t1_price
 
-            if sl_hit and t1_reached:
-                exit1_time = t
-                exit1_price = sl_price
-                exit2_time = t
-                exit2_price = sl_price
-                realized_points_total = points_from_move(sl_price)
-                status = "SL_HIT_AMBIGUOUS_BEFORE_T1"
-                break
             if sl_hit:
-                exit1_time = t
-                exit1_price = sl_price
-                exit2_time = t
-                exit2_price = sl_price
-                realized_points_total = points_from_move(sl_price)
-                status = "SL_HIT"
-                break
+                # conservative: if T1 also reached this candle, still book SL first
+                i1 = i
+                p1 = sl_price
+                i2 = i
+                p2 = sl_price
+                realized = side_code * (sl_price - entry_price)
+                status = 0 if t1_reached else 1
+                return status, i1, p1, i2, p2, realized, t1_hit
             if t1_reached:
                 t1_hit = True
-                exit1_time = t
-                exit1_price = t1_price
-                realized_points_total += points_from_move(t1_price) * half_qty
+                i1 = i
+                p1 = t1_price
+                realized += side_code * (t1_price - entry_price) * 0.5
                 continue
         else:
-            be_price = entry_price
-            be_hit = (l <= be_price) if side == "LONG" else (h >= be_price)
+            be_hit = (l <= entry_price) if side_code == 1 else (h >= entry_price)
             if be_hit:
-                exit2_time = t
-                exit2_price = be_price
-                realized_points_total += points_from_move(be_price) * rem_qty
-                status = "T1_THEN_BE"
-                break
+                i2 = i
+                p2 = entry_price
+                realized += side_code * (entry_price - entry_price) * 0.5
+                return 2, i1, p1, i2, p2, realized, t1_hit
+
+    return 3, i1, p1, i2, p2, realized, t1_hit
+
+
+if njit is not None:
+    _scan_scaleout = njit(cache=True)(_scan_scaleout)
+
+
+def simulate_scaleout_trade(day_slices: Dict[Any, Tuple], signal, target1_points: float = TARGET1_POINTS) -> Dict[str, Any]:
+    side = sig_side(signal)
+    entry_price = sig_entry(signal)
+    sl_price = sig_sl(signal)
+    signal_ts = pd.to_datetime(sig_time(signal), errors="coerce")
+
+    if pd.isna(signal_ts):
+        raise ValueError("Invalid signal time")
+    if side not in {"LONG", "SHORT"}:
+        raise ValueError(f"Unsupported side: {side}")
+
+    t1_price = entry_price + target1_points if side == "LONG" else entry_price - target1_points
+
+    day = day_slices.get(signal_ts.date())
+    start = 0 if day is None else int(day[0].searchsorted(signal_ts, side="left"))
+    if day is None or start >= len(day[0]):
+        return {
+            "entry_time": signal_ts, "side": side, "entry_price": entry_price, "sl_price": sl_price,
+            "t1_price": t1_price, "status": "NO_CANDLES_AFTER_SIGNAL", "error": "No candles after signal timestamp",
+            "realized_points_total": 0.0, "exit1_time": None, "exit1_price": None, "exit2_time": None, "exit2_price": None
+        }
+
+    times = day[0].iloc[start:].reset_index(drop=True)
+    high = day[1][start:]
+    low = day[2][start:]
+    close = day[3][start:]
+
+    rem_qty = 0.5
+    side_code = 1 if side == "LONG" else -1
+
+    status_code, i1, p1, i2, p2, realized_points_total, t1_hit = _scan_scaleout(
+        high, low, side_code, entry_price, sl_price, t1_price
+    )
+
+    exit1_time = times.iloc[i1] if i1 >= 0 else None
+    exit1_price = p1 if i1 >= 0 else None
+    exit2_time = times.iloc[i2] if i2 >= 0 else None
+    exit2_price = p2 if i2 >= 0 else None
+    status = _SCAN_STATUS[status_code]
 
     if status == "OPEN":
-        last_row = trade_df.iloc[-1]
-        last_t = last_row[time_col]
-        last_c = row_close(last_row)
+        last_t = times.iloc[-1]
+        last_c = float(close[-1])
         if not t1_hit:
             exit1_time = last_t
             exit1_price = last_c
-            realized_points_total = points_from_move(last_c)
+            realized_points_total = side_code * (last_c - entry_price)
             status = "EOD_EXIT_FULL"
         else:
             exit2_time = last_t
             exit2_price = last_c
-            realized_points_total += points_from_move(last_c) * rem_qty
+            realized_points_total += side_code * (last_c - entry_price) * rem_qty
             status = "T1_THEN_EOD"
 
     return {
@@ -379,6 +466,40 @@ def simulate_scaleout_trade(prepared_df: pd.DataFrame, signal, target1_points: f
     }
 
 
+def _simulate_one(day_slices, signal, target1_points: float):
+    """One signal -> result dict, with the SIM_ERROR fallback row on failure."""
+    try:
+        return simulate_scaleout_trade(day_slices, signal, target1_points=target1_points)
+    except Exception as e:
+        try:
+            side_val = sig_side(signal)
+        except Exception:
+            side_val = None
+        return {
+            "entry_time": pd.to_datetime(sig_time(signal), errors="coerce"),
+            "side": side_val,
+            "status": "SIM_ERROR",
+            "error": str(e),
+            "realized_points_total": 0.0,
+        }
+
+
+# Worker-side state for the process pool: the day-slice dict is shipped once
+# per worker via the pool initializer instead of being pickled per signal.
+_POOL_DAY_SLICES = None
+_POOL_TARGET1 = None
+
+
+def _pool_init(day_slices, target1_points: float) -> None:
+    global _POOL_DAY_SLICES, _POOL_TARGET1
+    _POOL_DAY_SLICES = day_slices
+    _POOL_TARGET1 = target1_points
+
+
+def _pool_sim(signal):
+    return _simulate_one(_POOL_DAY_SLICES, signal, _POOL_TARGET1)
+
+
 def main():
     profile = _parse_profile_arg()
     apply_strategy_profile(profile)
@@ -408,25 +529,58 @@ def main():
     print("First signal type:", type(signals[0]))
     print("First signal preview:", signals[0])
 
-    results = []
-    for s in signals:
-        try:
-            results.append(simulate_scaleout_trade(prepared_df, s, target1_points=TARGET1_POINTS))
-        except Exception as e:
-            try:
-                side_val = sig_side(s)
-            except Exception:
-                side_val = None
-            results.append({
-                "entry_time": pd.to_datetime(sig_time(s), errors="coerce"),
-                "side": side_val,
-                "status": "SIM_ERROR",
-                "error": str(e),
-                "realized_points_total": 0.0,
-            })
-
-    res_df = pd.DataFrame(results)
-    res_df.to_csv(OUTPUT_CSV, index=False)
+    day_slices = build_day_slices(prepared_df)
+
+    # Preallocate one typed column array per output field (SoA) instead of
+    # accumulating per-signal dicts and letting pd.DataFrame re-infer dtypes.
+    n = len(signals)
+    out: Dict[str, np.ndarray] = {
+        "entry_time": np.empty(n, dtype=object),
+        "side": np.empty(n, dtype=object),
+        "level_tag": np.empty(n, dtype=object),
+        "level_price": np.full(n, np.nan),
+        "entry_price": np.full(n, np.nan),
+        "sl_price": np.full(n, np.nan),
+        "t1_price": np.full(n, np.nan),
+        "exit1_time": np.empty(n, dtype=object),
+        "exit1_price": np.full(n, np.nan),
+        "exit2_time": np.empty(n, dtype=object),
+        "exit2_price": np.full(n, np.nan),
+        "status": np.empty(n, dtype=object),
+        "realized_points_total": np.zeros(n),
+        "t1_hit": np.empty(n, dtype=object),
+        "error": np.empty(n, dtype=object),
+    }
+    had_error = False
+
+    # Per-signal simulations are independent; fan out across processes when
+    # asked (--jobs / BACKTEST_JOBS). Default stays sequential — pool spin-up
+    # only pays off on large signal sets.
+    jobs = _parse_jobs_arg()
+    if jobs > 1 and n > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, n),
+            initializer=_pool_init,
+            initargs=(day_slices, TARGET1_POINTS),
+        ) as pool:
+            sims = list(pool.map(_pool_sim, signals, chunksize=max(1, n // (4 * jobs))))
+    else:
+        sims = [_simulate_one(day_slices, s, TARGET1_POINTS) for s in signals]
+
+    for i, sim in enumerate(sims):
+        for k, v in sim.items():
+            if v is not None:
+                out[k][i] = v
+        if sim.get("error") is not None:
+            had_error = True
+
+    if not had_error:
+        out.pop("error")
+
+    res_df = pd.DataFrame(out)
+    _write_csv(res_df, OUTPUT_CSV)
 
     print(f"\nSaved futures scale-out backtest results to: {OUTPUT_CSV}")
     print(f"Total simulated rows: {len(res_df)}")
@@ -6,7 +6,7 @@ proj_root = Path(__file__).resolve().parent.parent
 if str(proj_root) not in sys.path:
     sys.path.insert(0, str(proj_root))
 
-from dataclasses import asdict
+import numpy as np
 import pandas as pd
 from core.signal_engine import generate_signals, prepare_df
 
@@ -15,7 +15,54 @@ OUT = proj_root / "fut_backtest_scaleout_results.csv"
 
 TARGET1_POINTS = 40.0  # lot1 fixed target
 
-def simulate_scaleout_trade(df: pd.DataFrame, signal, target1_points: float = TARGET1_POINTS):
+def _read_csv(path):
+    # pyarrow's multithreaded CSV reader when available; stock parser otherwise
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except (ImportError, ValueError):
+        return pd.read_csv(path)
+
+
+def _write_csv(df, path) -> None:
+    # pyarrow's multithreaded C++ CSV writer when available; stock writer otherwise
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df.to_csv(path, index=False)
+        return
+    try:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(path))
+    except pa.ArrowInvalid:
+        df.to_csv(path, index=False)
+
+
+def build_day_bounds(df: pd.DataFrame) -> dict:
+    """
+    Map each trading day to its [start, end) positional range in the
+    prepared frame (sorted DatetimeIndex), so per-signal scans can slice
+    directly instead of re-deriving index.date for the whole frame.
+    """
+    dates = np.asarray(df.index.date)
+    starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+    ends = np.r_[starts[1:], len(dates)]
+    return {dates[s]: (int(s), int(e)) for s, e in zip(starts, ends)}
+
+def build_market_arrays(df: pd.DataFrame):
+    """
+    Pull the columns the simulator actually reads out of the prepared frame
+    once (timestamps + high/low/close), so per-signal scans slice NumPy
+    arrays instead of copying DataFrame rows.
+    """
+    return (
+        df.index,
+        df["high"].to_numpy(dtype=float),
+        df["low"].to_numpy(dtype=float),
+        df["close"].to_numpy(dtype=float),
+    )
+
+def simulate_scaleout_trade(df: pd.DataFrame, signal, target1_points: float = TARGET1_POINTS,
+                            day_bounds: dict | None = None, arrays=None):
     """
     Simulates 2-lot trade on FUT price:
 
@@ -64,15 +111,20 @@ def simulate_scaleout_trade(df: pd.DataFrame, signal, target1_points: float = TA
     lot1_done = False  # once TP/SL happens
     lot2_be_activated = False
 
-    # MAE / MFE (in FUT points, per trade)
-    max_favorable = 0.0
-    max_adverse = 0.0
-
-    # scan only same-day candles starting from entry candle
-    scan = df.iloc[entry_idx:].copy()
-    scan = scan[scan.index.date == trade_date].reset_index(drop=False)  # keep original index in "index"
+    # scan only same-day candles starting from entry candle; with day bounds
+    # this is pure positional slicing, no per-signal row copy
+    if day_bounds is not None:
+        start, end = day_bounds.get(trade_date, (entry_idx, entry_idx))
+        s0, e0 = max(entry_idx, start), end
+    else:
+        dates = np.asarray(df.index.date)
+        same = np.flatnonzero(dates[entry_idx:] == trade_date)
+        if same.size:
+            s0, e0 = entry_idx + int(same[0]), entry_idx + int(same[-1]) + 1
+        else:
+            s0 = e0 = entry_idx
 
-    if scan.empty:
+    if s0 >= e0:
         return {
             "lot1_exit_time": None, "lot1_exit_price": None, "lot1_exit_reason": "NO_DATA", "lot1_pnl_points": None,
             "lot2_exit_time": None, "lot2_exit_price": None, "lot2_exit_reason": "NO_DATA", "lot2_pnl_points": None,
@@ -81,22 +133,27 @@ def simulate_scaleout_trade(df: pd.DataFrame, signal, target1_points: float = TA
             "total_points_2lots": None, "effective_points_per_lot": None,
         }
 
-    for local_i, row in scan.iterrows():
-        ts = row["date"]
-        high_ = float(row["high"])
-        low_ = float(row["low"])
-        close_ = float(row["close"])
+    if arrays is None:
+        arrays = build_market_arrays(df)
+    times = arrays[0][s0:e0]
+    high_arr = arrays[1][s0:e0]
+    low_arr = arrays[2][s0:e0]
+    close_arr = arrays[3][s0:e0]
 
-        # Track MFE/MAE on FUT (using candle extremes vs entry)
-        if side == "LONG":
-            favorable = high_ - entry_price
-            adverse = entry_price - low_
-        else:
-            favorable = entry_price - low_
-            adverse = high_ - entry_price
+    # MFE/MAE on FUT (candle extremes vs entry) as array ops; the scalar
+    # max() updates per candle were a pure reduction, so one NumPy pass over
+    # the candles the loop actually visits gives the same numbers.
+    if side == "LONG":
+        favorable_arr = high_arr - entry_price
+        adverse_arr = entry_price - low_arr
+    else:
+        favorable_arr = entry_price - low_arr
+        adverse_arr = high_arr - entry_price
 
-        max_favorable = max(max_favorable, favorable)
-        max_adverse = max(max_adverse, adverse)
+    for local_i in range(e0 - s0):
+        ts = times[local_i]
+        high_ = high_arr[local_i]
+        low_ = low_arr[local_i]
 
         # ---------------------------
         # LOT 1 (fixed TP40 / initial SL)
@@ -164,9 +221,8 @@ def simulate_scaleout_trade(df: pd.DataFrame, signal, target1_points: float = TA
             # Update trailing only AFTER lot1 TP has happened and from next candles onward
             # (using previous completed candle low/high)
             if lot2_be_activated and local_i >= 1:
-                prev_row = scan.iloc[local_i - 1]
-                prev_low = float(prev_row["low"])
-                prev_high = float(prev_row["high"])
+                prev_low = low_arr[local_i - 1]
+                prev_high = high_arr[local_i - 1]
 
                 if side == "LONG":
                     # trail upward only
@@ -195,11 +251,15 @@ def simulate_scaleout_trade(df: pd.DataFrame, signal, target1_points: float = TA
         if (not lot1_open) and (not lot2_open):
             break
 
+    # reduce over the candles visited (loop var holds the last index; the
+    # floor of 0.0 matches the old running-max initial values)
+    max_favorable = max(0.0, float(favorable_arr[: local_i + 1].max()))
+    max_adverse = max(0.0, float(adverse_arr[: local_i + 1].max()))
+
     # EOD fallback exits for any open legs
     if lot1_open or lot2_open:
-        last_row = scan.iloc[-1]
-        eod_close = float(last_row["close"])
-        eod_ts = last_row["date"]
+        eod_close = float(close_arr[-1])
+        eod_ts = times[-1]
 
         if lot1_open:
             lot1_open = False
@@ -247,8 +307,8 @@ def main():
     if not CSV.exists():
         raise RuntimeError("nifty_fut_5m.csv not found. Run fetch_candles.py first.")
 
-    raw = pd.read_csv(CSV)
-    raw["date"] = pd.to_datetime(raw["date"])
+    raw = _read_csv(CSV)
+    raw["date"] = pd.to_datetime(raw["date"], format="ISO8601", cache=True)
 
     prepared = prepare_df(raw)
     signals = generate_signals(raw, target_points=40.0)  # signal generation unchanged
@@ -257,10 +317,14 @@ def main():
         print("No signals found.")
         return
 
+    day_bounds = build_day_bounds(prepared)
+    arrays = build_market_arrays(prepared)
+
     rows = []
     for s in signals:
-        sim = simulate_scaleout_trade(prepared, s, target1_points=TARGET1_POINTS)
-        row = asdict(s)
+        sim = simulate_scaleout_trade(prepared, s, target1_points=TARGET1_POINTS,
+                                      day_bounds=day_bounds, arrays=arrays)
+        row = s.to_dict()
         row.update(sim)
 
         # risk stats
@@ -272,7 +336,7 @@ def main():
         rows.append(row)
 
     res = pd.DataFrame(rows)
-    res.to_csv(OUT, index=False)
+    _write_csv(res, OUT)
 
     # Summary
     total = len(res)
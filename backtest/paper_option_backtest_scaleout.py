@@ -6,7 +6,7 @@ import sys
 import inspect
 import argparse
 from pathlib import Path
-from dataclasses import asdict, is_dataclass
+from dataclasses import is_dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
 # Add project root to sys.path so 'core' module can be found
@@ -98,7 +98,8 @@ def _sig_get(signal, *names):
             if name in signal and signal[name] is not None:
                 return signal[name]
     if is_dataclass(signal):
-        d = asdict(signal)
+        # shallow field lookup; asdict would deep-copy every field per call
+        d = vars(signal)
         for name in names:
             if name in d and d[name] is not None:
                 return d[name]
@@ -235,8 +236,37 @@ def get_instruments_df(kite: KiteConnect) -> pd.DataFrame:
     return df
 
 
-def find_option_contract(
+def build_option_lookup(
     instruments_df: pd.DataFrame,
+    underlying_symbol: str,
+) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """
+    Normalize the NFO dump once (name filter, upper-cased type, numeric
+    strike, parsed expiry) and index it by (instrument_type, strike) so
+    each signal's contract pick is an index lookup instead of a fresh
+    whole-table filter chain.
+    """
+    req_cols = {"tradingsymbol", "instrument_token", "name", "strike", "instrument_type", "expiry"}
+    missing = [c for c in req_cols if c not in instruments_df.columns]
+    if missing:
+        return None, f"Instrument master missing columns: {missing}"
+
+    df = instruments_df[
+        instruments_df["name"].astype(str).str.upper() == underlying_symbol.upper()
+    ].copy()
+    df["instrument_type"] = df["instrument_type"].astype(str).str.upper()
+    df["strike"] = pd.to_numeric(df["strike"], errors="coerce")
+    df["expiry"] = pd.to_datetime(df["expiry"], format="%Y-%m-%d", cache=True, errors="coerce")
+    df = df.dropna(subset=["strike", "expiry"])
+
+    # sort by the index keys first so .loc slices come back already ordered
+    # the way the old per-signal sort produced them
+    df = df.sort_values(["instrument_type", "strike", "expiry", "tradingsymbol"], kind="mergesort")
+    return df.set_index(["instrument_type", "strike"], drop=False), None
+
+
+def find_option_contract(
+    option_lookup: pd.DataFrame,
     signal_time: pd.Timestamp,
     underlying_symbol: str,
     side: str,
@@ -249,30 +279,20 @@ def find_option_contract(
     step = strike_step_for_underlying(underlying_symbol)
     atm_strike = round_to_step(fut_entry_price, step)
 
-    df = instruments_df.copy()
-    req_cols = {"tradingsymbol", "instrument_token", "name", "strike", "instrument_type", "expiry"}
-    missing = [c for c in req_cols if c not in df.columns]
-    if missing:
-        return None, f"Instrument master missing columns: {missing}"
-
-    df = df[df["name"].astype(str).str.upper() == underlying_symbol.upper()].copy()
-    df = df[df["instrument_type"].astype(str).str.upper() == opt_type].copy()
-
-    df["strike"] = pd.to_numeric(df["strike"], errors="coerce")
-    df = df[df["strike"] == float(atm_strike)].copy()
-    if df.empty:
+    try:
+        # list-of-keys indexing always yields a DataFrame with column dtypes
+        # intact, even when only one contract matches the key
+        rows = option_lookup.loc[[(opt_type, float(atm_strike))]]
+    except KeyError:
         return None, f"No {underlying_symbol} {opt_type} contract found for ATM strike {atm_strike}"
 
-    df["expiry"] = pd.to_datetime(df["expiry"], errors="coerce")
-    df = df.dropna(subset=["expiry"]).copy()
-
     trade_date = signal_time.date()
-    df = df[df["expiry"].dt.date >= trade_date].copy()
-    if df.empty:
+    rows = rows[rows["expiry"].dt.date >= trade_date]
+    if rows.empty:
         return None, f"No non-expired {underlying_symbol} {opt_type} contracts for strike {atm_strike}"
 
-    df = df.sort_values(["expiry", "tradingsymbol"]).reset_index(drop=True)
-    return df.iloc[0], None
+    # already sorted by (expiry, tradingsymbol) within the index group
+    return rows.iloc[0], None
 
 
 def fetch_option_intraday_candles(
@@ -298,6 +318,22 @@ def fetch_option_intraday_candles(
     return df
 
 
+def fetch_option_intraday_candles_cached(
+    kite: KiteConnect,
+    instrument_token: int,
+    signal_time: pd.Timestamp,
+    cache: Dict[Tuple[int, Any], pd.DataFrame],
+    interval: str = "5minute"
+) -> pd.DataFrame:
+    # signals that map to the same contract on the same day share one fetch
+    key = (int(instrument_token), signal_time.normalize())
+    df = cache.get(key)
+    if df is None:
+        df = fetch_option_intraday_candles(kite, instrument_token, signal_time, interval=interval)
+        cache[key] = df
+    return df
+
+
 def simulate_option_scaleout_from_fut_signal(
     option_candles: pd.DataFrame,
     signal_time: pd.Timestamp,
@@ -315,13 +351,22 @@ def simulate_option_scaleout_from_fut_signal(
     df["date"] = pd.to_datetime(df["date"], errors="coerce")
     df = df.dropna(subset=["date"]).sort_values("date").reset_index(drop=True)
 
-    trade_df = df[df["date"] >= signal_time].copy().reset_index(drop=True)
-    if trade_df.empty:
+    # dates are sorted above, so the first candle at/after the signal is a
+    # binary search away — no O(n) boolean mask per trade
+    start = int(df["date"].searchsorted(signal_time, side="left"))
+    if start >= len(df):
         return {"opt_error": "No option candles after signal time"}
+    trade_df = df.iloc[start:].reset_index(drop=True)
+
+    # hot loop below reads plain float arrays; per-row pandas indexing
+    # (iterrows / .loc) costs a Python dispatch per access
+    times = trade_df["date"].to_numpy()
+    high_arr = trade_df["high"].to_numpy(dtype=float)
+    low_arr = trade_df["low"].to_numpy(dtype=float)
+    close_arr = trade_df["close"].to_numpy(dtype=float)
 
-    entry_row = trade_df.iloc[0]
-    opt_entry: float = float(entry_row["close"])
-    opt_entry_time = entry_row["date"]
+    opt_entry: float = float(close_arr[0])
+    opt_entry_time = trade_df["date"].iloc[0]
 
     assumed_delta = 0.50
     opt_target_points: float = max(1.0, float(target1_points_underlying) * assumed_delta)
@@ -339,10 +384,10 @@ def simulate_option_scaleout_from_fut_signal(
     half: float = 0.5
     rem: float = 0.5
 
-    for _, row in trade_df.iterrows():
-        t = row["date"]
-        h: float = float(row["high"])
-        l: float = float(row["low"])
+    for i in range(len(trade_df)):
+        t = times[i]
+        h: float = high_arr[i]
+        l: float = low_arr[i]
 
         if not t1_hit:
             sl_hit = l <= opt_sl
@@ -377,14 +422,12 @@ def simulate_option_scaleout_from_fut_signal(
                 break
 
     if exit1_time is None and exit2_time is None:
-        last = trade_df.iloc[-1]
-        exit1_time = last["date"]
-        exit1_price = float(last["close"])
+        exit1_time = times[-1]
+        exit1_price = float(close_arr[-1])
         gross_points = (exit1_price - opt_entry)
     elif t1_hit and exit2_time is None:
-        last = trade_df.iloc[-1]
-        exit2_time = last["date"]
-        exit2_price = float(last["close"])
+        exit2_time = times[-1]
+        exit2_price = float(close_arr[-1])
         gross_points += (exit2_price - opt_entry) * rem
 
     assumed_lot_size = 75 if "NIFTY" in UNDERLYING_TRADINGSYMBOL.upper() else 15
@@ -462,7 +505,30 @@ def main():
         save_empty_option_results(OUTPUT_CSV_PATH)
         sys.exit(1)
 
-    rows = []
+    option_lookup, lookup_err = build_option_lookup(instruments_df, UNDERLYING_TRADINGSYMBOL)
+    if lookup_err:
+        print(f"❌ {lookup_err}")
+        save_empty_option_results(OUTPUT_CSV_PATH)
+        sys.exit(1)
+
+    candle_cache: Dict[Tuple[int, Any], pd.DataFrame] = {}
+
+    # column-wise accumulator: one list per output column instead of a dict
+    # per trade, so the final DataFrame is built from typed columns and no
+    # per-row key-union inference runs
+    result_cols = [
+        "entry_time", "side", "fut_entry", "fut_sl",
+        "opt_symbol", "opt_token", "opt_expiry", "opt_strike", "opt_type", "opt_lot_size",
+        "opt_entry_time", "opt_entry_price", "opt_exit1_price", "opt_exit2_price",
+        "opt_gross_total_pnl_rupees_2lots", "opt_charges_total_rupees_2lots",
+        "opt_net_total_pnl_rupees_2lots", "opt_error",
+    ]
+    cols: Dict[str, list] = {c: [] for c in result_cols}
+
+    def _append_row(values: Dict[str, Any]) -> None:
+        for c in result_cols:
+            cols[c].append(values.get(c))
+
     for s in signals:
         base = {
             "entry_time": sig_time(s),
@@ -478,24 +544,24 @@ def main():
 
             signal_time = pd.to_datetime(base["entry_time"], errors="coerce")
             if pd.isna(signal_time):
-                rows.append({**base, "opt_error": "Invalid signal time"})
+                _append_row({**base, "opt_error": "Invalid signal time"})
                 continue
 
             contract, err = find_option_contract(
-                instruments_df=instruments_df,
+                option_lookup=option_lookup,
                 signal_time=signal_time,
                 underlying_symbol=UNDERLYING_TRADINGSYMBOL,
                 side=base["side"],
                 fut_entry_price=float(base["fut_entry"]),
             )
             if err:
-                rows.append({**base, "opt_error": err})
+                _append_row({**base, "opt_error": err})
                 continue
 
             token: int = int(contract["instrument_token"])
             tradingsymbol: str = str(contract["tradingsymbol"])
 
-            opt_df = fetch_option_intraday_candles(kite, token, signal_time, interval="5minute")
+            opt_df = fetch_option_intraday_candles_cached(kite, token, signal_time, candle_cache, interval="5minute")
             sim = simulate_option_scaleout_from_fut_signal(
                 option_candles=opt_df,
                 signal_time=signal_time,
@@ -503,7 +569,7 @@ def main():
                 lots=LOTS,
             )
 
-            row = {
+            _append_row({
                 **base,
                 "opt_symbol": tradingsymbol,
                 "opt_token": token,
@@ -512,13 +578,12 @@ def main():
                 "opt_type": contract.get("instrument_type"),
                 "opt_lot_size": contract.get("lot_size"),
                 **sim,
-            }
-            rows.append(row)
+            })
 
         except Exception as e:
-            rows.append({**base, "opt_error": str(e)})
+            _append_row({**base, "opt_error": str(e)})
 
-    out_df = pd.DataFrame(rows)
+    out_df = pd.DataFrame(cols)
     out_df.to_csv(OUTPUT_CSV_PATH, index=False)
 
     print(f"Saved option scale-out results to: {OUTPUT_CSV_PATH}")
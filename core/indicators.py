@@ -1,6 +1,34 @@
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except Exception:
+    njit = None  # optional speedup; add_ema falls back to pandas ewm
+
+
+def _ema_kernel(x, alpha):
+    n = x.shape[0]
+    y = np.empty(n)
+    y[0] = x[0]
+    one_m = 1.0 - alpha
+    for i in range(1, n):
+        y[i] = alpha * x[i] + one_m * y[i - 1]
+    return y
+
+
+if njit is not None:
+    _ema_kernel = njit(cache=True)(_ema_kernel)
+
+
 def add_ema(df: pd.DataFrame, period: int, price_col: str = "close") -> pd.Series:
+    if njit is not None and len(df) > 0:
+        x = df[price_col].to_numpy(dtype=np.float64)
+        # the compiled recurrence does not skip NaNs the way ewm does, so
+        # only take it on clean input
+        if not np.isnan(x).any():
+            alpha = 2.0 / (period + 1.0)
+            return pd.Series(_ema_kernel(x, alpha), index=df.index)
     return df[price_col].ewm(span=period, adjust=False).mean()
 
 def add_intraday_vwap(df: pd.DataFrame) -> pd.Series:
@@ -8,44 +36,72 @@ def add_intraday_vwap(df: pd.DataFrame) -> pd.Series:
     VWAP resets each trading day.
     Assumes df has columns: date, high, low, close, volume
     """
-    out = df.copy()
-    out["session"] = out["date"].dt.date
-    tp = (out["high"] + out["low"] + out["close"]) / 3.0
-    pv = tp * out["volume"]
+    if len(df) == 0:
+        return pd.Series(dtype=float, index=df.index)
 
-    out["_cum_pv"] = pv.groupby(out["session"]).cumsum()
-    out["_cum_vol"] = out["volume"].groupby(out["session"]).cumsum()
-    vwap = out["_cum_pv"] / out["_cum_vol"].replace(0, pd.NA)
-    return vwap
+    tp = ((df["high"] + df["low"] + df["close"]) / 3.0).to_numpy(dtype=float)
+    vol = df["volume"].to_numpy(dtype=float)
+    pv = tp * vol
+
+    session = df["date"].dt.normalize().to_numpy()
+    if pd.Series(session).is_monotonic_increasing:
+        # sorted input: sessions are contiguous runs, so per-day cumulative
+        # sums are plain cumsums restarted at each day boundary — no
+        # groupby hashing/dispatch
+        bounds = np.flatnonzero(np.r_[True, session[1:] != session[:-1]])
+        bounds = np.r_[bounds, len(pv)]
+        cum_pv = np.empty_like(pv)
+        cum_vol = np.empty_like(vol)
+        for s, e in zip(bounds[:-1], bounds[1:]):
+            cum_pv[s:e] = np.cumsum(pv[s:e])
+            cum_vol[s:e] = np.cumsum(vol[s:e])
+    else:
+        cum_pv = pd.Series(pv).groupby(session).cumsum().to_numpy()
+        cum_vol = pd.Series(vol).groupby(session).cumsum().to_numpy()
+
+    vwap = cum_pv / np.where(cum_vol == 0, np.nan, cum_vol)
+    return pd.Series(vwap, index=df.index)
 
 def compute_daily_traditional_pivots(intraday_df: pd.DataFrame) -> pd.DataFrame:
     """
     Compute previous-day-based daily pivots and map them onto each intraday row.
     Returns columns added: P, R1, S1, R2, S2
     """
-    df = intraday_df.copy()
+    df = intraday_df.copy(deep=False)
     df["trade_date"] = df["date"].dt.date
 
-    daily = (
-        df.groupby("trade_date", as_index=False)
-        .agg(day_high=("high", "max"),
-             day_low=("low", "min"),
-             day_close=("close", "last"))
-        .sort_values("trade_date")
-        .reset_index(drop=True)
-    )
+    # bucket rows by day through factorize codes; per-day aggregates and the
+    # broadcast back to intraday rows are then plain array indexing instead
+    # of a groupby plus a hash merge
+    codes, _ = pd.factorize(df["trade_date"], sort=True)
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    close = df["close"].to_numpy(dtype=float)
+
+    n_days = int(codes.max()) + 1 if len(codes) else 0
+    day_high = np.full(n_days, -np.inf)
+    np.maximum.at(day_high, codes, high)
+    day_low = np.full(n_days, np.inf)
+    np.minimum.at(day_low, codes, low)
+    # repeated fancy assignment keeps the last row of each day
+    day_close = np.empty(n_days)
+    day_close[codes] = close
 
     # previous day's OHLC drives current day pivots
-    daily["prev_high"] = daily["day_high"].shift(1)
-    daily["prev_low"] = daily["day_low"].shift(1)
-    daily["prev_close"] = daily["day_close"].shift(1)
-
-    daily["P"] = (daily["prev_high"] + daily["prev_low"] + daily["prev_close"]) / 3.0
-    daily["R1"] = 2 * daily["P"] - daily["prev_low"]
-    daily["S1"] = 2 * daily["P"] - daily["prev_high"]
-    daily["R2"] = daily["P"] + (daily["prev_high"] - daily["prev_low"])
-    daily["S2"] = daily["P"] - (daily["prev_high"] - daily["prev_low"])
-
-    piv = daily[["trade_date", "P", "R1", "S1", "R2", "S2"]]
-    merged = df.merge(piv, on="trade_date", how="left")
+    prev_high = np.r_[np.nan, day_high[:-1]]
+    prev_low = np.r_[np.nan, day_low[:-1]]
+    prev_close = np.r_[np.nan, day_close[:-1]]
+
+    p = (prev_high + prev_low + prev_close) / 3.0
+    r1 = 2 * p - prev_low
+    s1 = 2 * p - prev_high
+    r2 = p + (prev_high - prev_low)
+    s2 = p - (prev_high - prev_low)
+
+    merged = df.reset_index(drop=True)
+    merged["P"] = p[codes]
+    merged["R1"] = r1[codes]
+    merged["S1"] = s1[codes]
+    merged["R2"] = r2[codes]
+    merged["S2"] = s2[codes]
     return merged
\ No newline at end of file
@@ -73,15 +73,18 @@ class Signal:
 # Helpers
 # =============================================================================
 def _ensure_datetime_index(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-
-    if isinstance(out.index, pd.DatetimeIndex):
-        return out.sort_index()
+    if isinstance(df.index, pd.DatetimeIndex):
+        return df.sort_index()
 
     # Common timestamp column names
     for c in ["date", "datetime", "timestamp", "time"]:
-        if c in out.columns:
-            out[c] = pd.to_datetime(out[c], errors="coerce")
+        if c in df.columns:
+            # shallow copy: only the parsed column is rewritten, the rest
+            # stays shared with the caller's frame (copy-on-write)
+            out = df.copy(deep=False)
+            # candles come from our own CSVs, which are ISO timestamps; the
+            # explicit format keeps the fast C parser engaged
+            out[c] = pd.to_datetime(out[c], format="ISO8601", cache=True, errors="coerce")
             out = out.dropna(subset=[c]).sort_values(c).set_index(c)
             return out
 
@@ -100,12 +103,10 @@ def _find_col(df: pd.DataFrame, candidates: list[str]) -> str:
 
 
 def _normalize_ohlc_columns(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-
-    open_col = _find_col(out, ["open", "o"])
-    high_col = _find_col(out, ["high", "h"])
-    low_col = _find_col(out, ["low", "l"])
-    close_col = _find_col(out, ["close", "c"])
+    open_col = _find_col(df, ["open", "o"])
+    high_col = _find_col(df, ["high", "h"])
+    low_col = _find_col(df, ["low", "l"])
+    close_col = _find_col(df, ["close", "c"])
 
     rename_map = {
         open_col: "open",
@@ -113,8 +114,8 @@ def _normalize_ohlc_columns(df: pd.DataFrame) -> pd.DataFrame:
         low_col: "low",
         close_col: "close",
     }
-    out = out.rename(columns=rename_map)
-    return out
+    # rename already returns a new frame; no defensive copy needed
+    return df.rename(columns=rename_map)
 
 
 def _daily_pivots(prev_day_high: float, prev_day_low: float, prev_day_close: float):
@@ -131,41 +132,39 @@ def _compute_prev_day_pivot_levels(df: pd.DataFrame) -> pd.DataFrame:
     Add pivot columns (PP, R1, R2, S1, S2) for each intraday row
     using PREVIOUS trading day's H/L/C.
     """
-    out = df.copy()
+    out = df.copy(deep=False)
 
     # local date buckets from index
     out["trade_date"] = out.index.date
 
-    daily = (
-        out.groupby("trade_date")
-        .agg(day_high=("high", "max"), day_low=("low", "min"), day_close=("close", "last"))
-        .sort_index()
-    )
-
-    # previous day values
-    daily["prev_day_high"] = daily["day_high"].shift(1)
-    daily["prev_day_low"] = daily["day_low"].shift(1)
-    daily["prev_day_close"] = daily["day_close"].shift(1)
-
-    pivots = daily.apply(
-        lambda r: pd.Series(
-            _daily_pivots(r["prev_day_high"], r["prev_day_low"], r["prev_day_close"])
-        )
-        if pd.notna(r["prev_day_high"]) and pd.notna(r["prev_day_low"]) and pd.notna(r["prev_day_close"])
-        else pd.Series([np.nan, np.nan, np.nan, np.nan, np.nan]),
-        axis=1,
-    )
-    pivots.columns = ["PP", "R1", "R2", "S1", "S2"]
-
-    daily = pd.concat([daily, pivots], axis=1)
-
-    # merge back to intraday rows by trade_date
-    out = out.merge(
-        daily[["PP", "R1", "R2", "S1", "S2"]],
-        left_on="trade_date",
-        right_index=True,
-        how="left",
-    )
+    # integer day codes: grouping and the broadcast back to intraday rows
+    # become plain array indexing, so nothing compares datetime.date objects
+    codes, _ = pd.factorize(out["trade_date"], sort=True)
+    high = out["high"].to_numpy(dtype=float)
+    low = out["low"].to_numpy(dtype=float)
+    close = out["close"].to_numpy(dtype=float)
+
+    n_days = int(codes.max()) + 1 if len(codes) else 0
+    day_high = np.full(n_days, -np.inf)
+    np.maximum.at(day_high, codes, high)
+    day_low = np.full(n_days, np.inf)
+    np.minimum.at(day_low, codes, low)
+    # repeated fancy assignment keeps the last row of each day
+    day_close = np.empty(n_days)
+    day_close[codes] = close
+
+    # previous day values; NaN from a missing previous day propagates
+    # through the pivot arithmetic, which is the guard the old code had
+    prev_high = np.r_[np.nan, day_high[:-1]]
+    prev_low = np.r_[np.nan, day_low[:-1]]
+    prev_close = np.r_[np.nan, day_close[:-1]]
+
+    pp = (prev_high + prev_low + prev_close) / 3.0
+    out["PP"] = pp[codes]
+    out["R1"] = (2 * pp - prev_low)[codes]
+    out["R2"] = (pp + (prev_high - prev_low))[codes]
+    out["S1"] = (2 * pp - prev_high)[codes]
+    out["S2"] = (pp - (prev_high - prev_low))[codes]
 
     return out
 
@@ -267,25 +266,50 @@ def _make_short_signal(
 # =============================================================================
 # Public API
 # =============================================================================
+# One-slot memo for prepare_df. Backtest sweeps call generate_signals several
+# times on the same raw history (different target_points etc.), and each call
+# would otherwise redo pivots/indicators from scratch.
+_PREPARE_CACHE: dict = {"key": None, "value": None}
+
+
+def _prepare_cache_key(df: pd.DataFrame):
+    try:
+        if isinstance(df.index, pd.DatetimeIndex):
+            last_ts = df.index[-1]
+        else:
+            last_ts = df["date"].iloc[-1]
+    except Exception:
+        return None
+    return (id(df), len(df), last_ts)
+
+
 def prepare_df(df: pd.DataFrame) -> pd.DataFrame:
     """
     Prepare raw candle dataframe for signal generation.
     Expected input: intraday OHLC data with datetime index or a datetime column.
     Returns a dataframe with normalized OHLC + pivot levels.
+
+    Repeated calls with the same (unmodified) input frame return a cached
+    result, so parameter sweeps don't pay for indicators more than once.
     """
+    key = _prepare_cache_key(df)
+    if key is not None and key == _PREPARE_CACHE["key"]:
+        return _PREPARE_CACHE["value"]
+
     out = _ensure_datetime_index(df)
     out = _normalize_ohlc_columns(out)
 
-    # Keep only rows with valid OHLC
-    out = out.dropna(subset=["open", "high", "low", "close"]).copy()
+    # Keep only rows with valid OHLC (dropna/boolean selection already
+    # return fresh frames, so no .copy() chasers)
+    out = out.dropna(subset=["open", "high", "low", "close"])
 
     # Ensure numeric
     for c in ["open", "high", "low", "close"]:
         out[c] = pd.to_numeric(out[c], errors="coerce")
-    out = out.dropna(subset=["open", "high", "low", "close"]).copy()
+    out = out.dropna(subset=["open", "high", "low", "close"])
 
     # Basic sanity
-    out = out[(out["high"] >= out["low"])].copy()
+    out = out[(out["high"] >= out["low"])]
 
     # Add pivots
     out = _compute_prev_day_pivot_levels(out)
@@ -294,6 +318,22 @@ def prepare_df(df: pd.DataFrame) -> pd.DataFrame:
     out["candle_body"] = (out["close"] - out["open"]).abs()
     out["candle_range"] = (out["high"] - out["low"]).abs()
 
+    # Per-row side filters, computed once here instead of per generate_signals
+    # call (a parameter sweep re-reads these columns for free via the cache)
+    out["long_ok"] = out["close"] >= out["open"]
+    out["short_ok"] = out["close"] <= out["open"]
+
+    # wall-clock as an HHMM int per bar; cutoff checks become one integer
+    # comparison instead of re-deriving hour/minute from the index
+    out["_hhmm"] = out.index.hour * 100 + out.index.minute
+
+    # rows with a full pivot set (the first session of the history has none)
+    out["_has_pivots"] = out[["PP", "R1", "R2", "S1", "S2"]].notna().all(axis=1)
+
+    if key is not None:
+        _PREPARE_CACHE["key"] = key
+        _PREPARE_CACHE["value"] = out
+
     return out
 
 
@@ -310,7 +350,8 @@ def generate_signals(
     pp_entry_cutoff_hhmm: Optional[int] = None,
     max_candle_range_points: Optional[float] = None,
     max_sl_distance_points: Optional[float] = None,
-) -> List[Signal]:
+    as_frame: bool = False,
+) -> List[Signal] | pd.DataFrame:
     """
     Generate pivot breakout signals.
 
@@ -319,136 +360,207 @@ def generate_signals(
     - returns List[Signal] (fixes test_signals expectations)
     - Signal contains `entry_idx` (fixes backtest_fut_exits_scaleout expectations)
     """
-    prepared = prepare_df(df) if "R1" not in df.columns else df.copy()
+    prepared = prepare_df(df) if "R1" not in df.columns else df
     allow_long_pp = ALLOW_LONG_PP if allow_long_pp is None else bool(allow_long_pp)
     allow_short_pp = ALLOW_SHORT_PP if allow_short_pp is None else bool(allow_short_pp)
 
+    n = len(prepared)
+    if n == 0:
+        return _empty_signal_frame() if as_frame else []
+
+    # Detection is fully vectorized: every filter and level condition becomes
+    # a boolean mask over the whole history, and Signal objects are only
+    # built for the (rare) bars where a mask fires.
+    times = prepared.index
+    o = prepared["open"].to_numpy(dtype=float)
+    h = prepared["high"].to_numpy(dtype=float)
+    l = prepared["low"].to_numpy(dtype=float)
+    c = prepared["close"].to_numpy(dtype=float)
+    levels = {name: prepared[name].to_numpy(dtype=float) for name in ("PP", "R1", "R2", "S1", "S2")}
+
+    def _cutoff_as_hhmm(cutoff_hhmm: Optional[int]) -> int:
+        if cutoff_hhmm is None:
+            return ENTRY_CUTOFF_HOUR * 100 + ENTRY_CUTOFF_MINUTE
+        return int(cutoff_hhmm)
+
+    # HHMM ints order the same way minutes-of-day do, so the inclusive
+    # cutoff check is a single integer comparison per bar
+    if "_hhmm" in prepared.columns:
+        hhmm = prepared["_hhmm"].to_numpy()
+    else:
+        hhmm = times.hour.to_numpy() * 100 + times.minute.to_numpy()
+    time_ok = hhmm <= _cutoff_as_hhmm(entry_cutoff_hhmm)
+    pp_time_ok = hhmm <= _cutoff_as_hhmm(pp_entry_cutoff_hhmm)
+
+    if "_has_pivots" in prepared.columns:
+        has_pivots = prepared["_has_pivots"].to_numpy(dtype=bool)
+    else:
+        has_pivots = ~np.isnan(levels["PP"])
+        for name in ("R1", "R2", "S1", "S2"):
+            has_pivots &= ~np.isnan(levels[name])
+
+    base = has_pivots & time_ok & (np.abs(c - o) >= float(min_body_points))
+    if max_candle_range_points is not None:
+        base &= np.abs(h - l) <= float(max_candle_range_points)
+
+    # SL placement mirrors _make_long_signal/_make_short_signal: candle
+    # extreme with a 0.1 buffer, falling back to the fixed buffer when the
+    # extreme sits on the wrong side of entry
+    sl_long = np.where(np.isfinite(l - 0.1) & (l - 0.1 < c), l - 0.1, c - float(sl_buffer_points))
+    sl_short = np.where(np.isfinite(h + 0.1) & (h + 0.1 > c), h + 0.1, c + float(sl_buffer_points))
+    if max_sl_distance_points is not None:
+        long_sl_ok = np.abs(c - sl_long) <= float(max_sl_distance_points)
+        short_sl_ok = np.abs(c - sl_short) <= float(max_sl_distance_points)
+    else:
+        long_sl_ok = short_sl_ok = np.ones(n, dtype=bool)
+
+    tol = float(touch_tolerance)
+    bc = float(break_confirmation)
+    if "long_ok" in prepared.columns:
+        bullish = prepared["long_ok"].to_numpy(dtype=bool)
+        bearish = prepared["short_ok"].to_numpy(dtype=bool)
+    else:
+        bullish = c >= o
+        bearish = c <= o
+
+    def _touched(level: np.ndarray) -> np.ndarray:
+        return ((l - tol) <= level) & (level <= (h + tol))
+
+    # the side-specific legs are shared by every level on that side, so fold
+    # them into base masks once instead of re-ANDing per spec
+    long_base = base & bullish & long_sl_ok
+    short_base = base & bearish & short_sl_ok
+
+    # one (level, side, mask) spec per enabled setup, in the same order the
+    # old per-row loop checked them so the emitted signal order is unchanged
+    specs: list = []
+    pp = levels["PP"]
+    if allow_long_pp:
+        specs.append(("PP", "LONG", long_base & pp_time_ok & _touched(pp) & (c > pp + bc)))
+    if allow_short_pp:
+        specs.append(("PP", "SHORT", short_base & pp_time_ok & _touched(pp) & (c < pp - bc)))
+    if ALLOW_LONG_R1:
+        r1 = levels["R1"]
+        specs.append(("R1", "LONG", long_base & _touched(r1) & (c > r1 + bc)))
+    if ALLOW_LONG_R2:
+        r2 = levels["R2"]
+        specs.append(("R2", "LONG", long_base & _touched(r2) & (c > r2 + bc)))
+    if ALLOW_SHORT_S1:
+        s1 = levels["S1"]
+        specs.append(("S1", "SHORT", short_base & _touched(s1) & (c < s1 - bc)))
+    if ALLOW_SHORT_S2:
+        s2 = levels["S2"]
+        specs.append(("S2", "SHORT", short_base & _touched(s2) & (c < s2 - bc)))
+
+    # stacking the masks row-major means flat indices come back already
+    # ordered by (bar, spec rank) — one C-level pass, no Python-side sort
+    if specs:
+        stacked = np.column_stack([mask for _, _, mask in specs])
+        n_specs = stacked.shape[1]
+        flat = np.flatnonzero(stacked)
+        hits = [(int(f // n_specs), int(f % n_specs)) for f in flat]
+    else:
+        hits = []
+
+    if as_frame:
+        # SoA output: one typed column per field, filled by fancy indexing —
+        # no Signal objects on this path
+        if not hits:
+            return _empty_signal_frame()
+        idx = np.fromiter((i for i, _ in hits), dtype=np.int64, count=len(hits))
+        ranks = np.fromiter((r for _, r in hits), dtype=np.int64, count=len(hits))
+        spec_names = np.array([name for name, _, _ in specs])
+        spec_sides = np.array([side for _, side, _ in specs])
+        level_stack = np.stack([levels[name] for name, _, _ in specs])
+        side_code = np.where(spec_sides[ranks] == "LONG", 1, -1).astype(np.int8)
+        entry = c[idx]
+        return pd.DataFrame(
+            {
+                "entry_idx": idx,
+                "entry_time": times[idx],
+                "side": spec_sides[ranks],
+                "side_code": side_code,
+                "level_name": spec_names[ranks],
+                "level_value": level_stack[ranks, idx],
+                "entry": entry,
+                "sl": np.where(side_code == 1, sl_long[idx], sl_short[idx]),
+                "tp": entry + side_code * float(target_points),
+                "trigger_open": o[idx],
+                "trigger_high": h[idx],
+                "trigger_low": l[idx],
+                "trigger_close": c[idx],
+            }
+        )
+
     signals: List[Signal] = []
+    for i, rank in hits:
+        level_name, side, _ = specs[rank]
+        entry = float(c[i])
+        if side == "LONG":
+            sl = float(sl_long[i])
+            tp = entry + float(target_points)
+        else:
+            sl = float(sl_short[i])
+            tp = entry - float(target_points)
+        signals.append(
+            Signal(
+                entry_idx=i,
+                entry_time=times[i],
+                side=side,
+                level_name=level_name,
+                level_value=float(levels[level_name][i]),
+                entry=entry,
+                sl=sl,
+                tp=tp,
+                trigger_open=float(o[i]),
+                trigger_high=float(h[i]),
+                trigger_low=float(l[i]),
+                trigger_close=float(c[i]),
+            )
+        )
+
+    return signals
 
-    # Iterate row by row
-    for i, (ts, row) in enumerate(prepared.iterrows()):
-        # Need pivot levels present
-        if (
-            pd.isna(row.get("PP"))
-            or pd.isna(row.get("R1"))
-            or pd.isna(row.get("R2"))
-            or pd.isna(row.get("S1"))
-            or pd.isna(row.get("S2"))
-        ):
-            continue
-
-        # Entry time filter (v2)
-        if not _within_custom_cutoff(ts, entry_cutoff_hhmm):
-            continue
-
-        # Minimal candle body filter (optional)
-        if _body_size(row) < float(min_body_points):
-            continue
-
-        # Max candle range filter (optional)
-        if max_candle_range_points is not None and _range_size(row) > float(max_candle_range_points):
-            continue
-
-        o = float(row["open"])
-        h = float(row["high"])
-        l = float(row["low"])
-        c = float(row["close"])
-
-        # ---- PIVOT (PP) logic ----
-        if allow_long_pp:
-            pp = float(row["PP"])
-            if (
-                _within_custom_cutoff(ts, pp_entry_cutoff_hhmm)
-                and
-                _touched_level(row, pp, touch_tolerance)
-                and c > (pp + break_confirmation)
-                and c >= o
-            ):
-                sig = _make_long_signal(i, ts, row, "PP", pp, target_points, sl_buffer_points)
-                if (
-                    max_sl_distance_points is None
-                    or abs(float(sig.entry) - float(sig.sl)) <= float(max_sl_distance_points)
-                ):
-                    signals.append(sig)
-
-        if allow_short_pp:
-            pp = float(row["PP"])
-            if (
-                _within_custom_cutoff(ts, pp_entry_cutoff_hhmm)
-                and
-                _touched_level(row, pp, touch_tolerance)
-                and c < (pp - break_confirmation)
-                and c <= o
-            ):
-                sig = _make_short_signal(i, ts, row, "PP", pp, target_points, sl_buffer_points)
-                if (
-                    max_sl_distance_points is None
-                    or abs(float(sig.entry) - float(sig.sl)) <= float(max_sl_distance_points)
-                ):
-                    signals.append(sig)
-
-        # ---- LONG logic ----
-        # R1 breakout: candle touches R1 and closes above (with optional confirmation)
-        if ALLOW_LONG_R1:
-            r1 = float(row["R1"])
-            if (
-                _touched_level(row, r1, touch_tolerance)
-                and c > (r1 + break_confirmation)
-                and c >= o  # bullish bias
-            ):
-                sig = _make_long_signal(i, ts, row, "R1", r1, target_points, sl_buffer_points)
-                if (
-                    max_sl_distance_points is None
-                    or abs(float(sig.entry) - float(sig.sl)) <= float(max_sl_distance_points)
-                ):
-                    signals.append(sig)
-
-        # R2 breakout
-        if ALLOW_LONG_R2:
-            r2 = float(row["R2"])
-            if (
-                _touched_level(row, r2, touch_tolerance)
-                and c > (r2 + break_confirmation)
-                and c >= o
-            ):
-                sig = _make_long_signal(i, ts, row, "R2", r2, target_points, sl_buffer_points)
-                if (
-                    max_sl_distance_points is None
-                    or abs(float(sig.entry) - float(sig.sl)) <= float(max_sl_distance_points)
-                ):
-                    signals.append(sig)
-
-        # ---- SHORT logic ----
-        # S1 breakdown: candle touches S1 and closes below
-        if ALLOW_SHORT_S1:
-            s1 = float(row["S1"])
-            if (
-                _touched_level(row, s1, touch_tolerance)
-                and c < (s1 - break_confirmation)
-                and c <= o  # bearish bias
-            ):
-                sig = _make_short_signal(i, ts, row, "S1", s1, target_points, sl_buffer_points)
-                if (
-                    max_sl_distance_points is None
-                    or abs(float(sig.entry) - float(sig.sl)) <= float(max_sl_distance_points)
-                ):
-                    signals.append(sig)
-
-        # S2 breakdown (disabled in v2 by default)
-        if ALLOW_SHORT_S2:
-            s2 = float(row["S2"])
-            if (
-                _touched_level(row, s2, touch_tolerance)
-                and c < (s2 - break_confirmation)
-                and c <= o
-            ):
-                sig = _make_short_signal(i, ts, row, "S2", s2, target_points, sl_buffer_points)
-                if (
-                    max_sl_distance_points is None
-                    or abs(float(sig.entry) - float(sig.sl)) <= float(max_sl_distance_points)
-                ):
-                    signals.append(sig)
 
+def _empty_signal_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        columns=[
+            "entry_idx", "entry_time", "side", "side_code", "level_name", "level_value",
+            "entry", "sl", "tp", "trigger_open", "trigger_high", "trigger_low", "trigger_close"
+        ]
+    )
+
+
+def generate_signal_frame(df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    """
+    Column-oriented variant of generate_signals: same detection, but the
+    result is a typed DataFrame (with an int8 `side_code`, +1 long / -1
+    short) that downstream vectorized consumers can use directly.
+    Accepts the same keyword arguments as generate_signals.
+    """
+    return generate_signals(df, as_frame=True, **kwargs)
+
+
+def signals_from_frame(frame: pd.DataFrame) -> List[Signal]:
+    """Thin compatibility shim: rebuild Signal objects from a signal frame."""
+    signals: List[Signal] = []
+    for row in frame.itertuples(index=False):
+        signals.append(
+            Signal(
+                entry_idx=int(row.entry_idx),
+                entry_time=pd.Timestamp(row.entry_time),
+                side=str(row.side),
+                level_name=str(row.level_name),
+                level_value=float(row.level_value),
+                entry=float(row.entry),
+                sl=float(row.sl),
+                tp=float(row.tp),
+                trigger_open=float(row.trigger_open),
+                trigger_high=float(row.trigger_high),
+                trigger_low=float(row.trigger_low),
+                trigger_close=float(row.trigger_close),
+            )
+        )
     return signals
 
 
@@ -496,7 +496,7 @@ def get_underlying_token(
 
     fut = fut[fut["segment"].astype(str).str.upper() == "NFO-FUT"].copy()
     fut = fut[fut["name"].astype(str).str.upper() == str(fut_name).upper()].copy()
-    fut["expiry"] = pd.to_datetime(fut["expiry"], errors="coerce")
+    fut["expiry"] = pd.to_datetime(fut["expiry"], format="%Y-%m-%d", cache=True, errors="coerce")
     fut = fut.dropna(subset=["expiry"]).copy()
 
     today = _now_local().date()
@@ -720,30 +720,32 @@ def find_option_contract(
     step = strike_step_for_underlying(underlying_name)
     atm_strike = round_to_step(fut_entry_price, step)
 
-    df = nfo_df.copy()
     required = {"tradingsymbol", "instrument_token", "name", "strike", "instrument_type", "expiry", "lot_size"}
-    missing = [c for c in required if c not in df.columns]
+    missing = [c for c in required if c not in nfo_df.columns]
     if missing:
         return None, f"NFO instruments missing columns: {missing}"
 
-    df = df[df["name"].astype(str).str.upper() == underlying_name.upper()].copy()
-    df = df[df["instrument_type"].astype(str).str.upper() == opt_type].copy()
-    df["strike"] = pd.to_numeric(df["strike"], errors="coerce")
-    df = df[df["strike"] == float(atm_strike)].copy()
+    # pure selection below — boolean indexing already yields fresh frames,
+    # so no defensive copies
+    df = nfo_df[nfo_df["name"].astype(str).str.upper() == underlying_name.upper()]
+    df = df[df["instrument_type"].astype(str).str.upper() == opt_type]
+    df = df[pd.to_numeric(df["strike"], errors="coerce") == float(atm_strike)]
 
     if df.empty:
         return None, f"No {underlying_name} {opt_type} at strike {atm_strike}"
 
-    df["expiry"] = pd.to_datetime(df["expiry"], errors="coerce")
-    df = df.dropna(subset=["expiry"]).copy()
-
-    trade_date = signal_time.date()
-    df = df[df["expiry"].dt.date >= trade_date].copy()
+    expiry = pd.to_datetime(df["expiry"], format="%Y-%m-%d", cache=True, errors="coerce")
+    df = df[expiry.notna() & (expiry.dt.date >= signal_time.date())]
     if df.empty:
         return None, f"No non-expired contract for {underlying_name} {opt_type} {atm_strike}"
-
-    df = df.sort_values(["expiry", "tradingsymbol"]).reset_index(drop=True)
-    return df.iloc[0], None
+    df = df.assign(expiry=expiry[df.index])
+
+    # nearest expiry via a single min pass instead of sorting the whole
+    # candidate set; the tie group (same expiry, same strike) is tiny
+    nearest = df[df["expiry"] == df["expiry"].min()]
+    if len(nearest) > 1:
+        nearest = nearest.sort_values("tradingsymbol")
+    return nearest.iloc[0], None
 
 
 # ============================================================
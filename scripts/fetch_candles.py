@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 import pandas as pd
@@ -8,47 +9,82 @@ OUT = Path(__file__).resolve().parent / "nifty_fut_5m.csv"
 # Keep under Zerodha's max range for 5m candles
 CHUNK_DAYS = 90
 LOOKBACK_DAYS = 180   # change this to 60 / 90 / 180 as needed
+FETCH_WORKERS = 3     # modest parallelism to stay under the historical-API rate limit
+
+def load_instruments_df(instruments_csv) -> pd.DataFrame:
+    """
+    Load the instrument dump, keeping a Parquet sibling as a typed cache
+    (expiry pre-parsed). The cache is rebuilt whenever the CSV is newer;
+    without a parquet engine installed this quietly stays on plain CSV.
+    """
+    csv_path = Path(instruments_csv)
+    cache = csv_path.with_suffix(".parquet")
+    try:
+        if cache.exists() and cache.stat().st_mtime >= csv_path.stat().st_mtime:
+            return pd.read_parquet(cache)
+    except Exception:
+        pass
+    df = pd.read_csv(csv_path)
+    if "expiry" in df.columns:
+        df["expiry"] = pd.to_datetime(df["expiry"], format="%Y-%m-%d", cache=True, errors="coerce")
+    try:
+        df.to_parquet(cache, index=False)
+    except Exception:
+        pass
+    return df
 
 def get_near_nifty_fut_token(instruments_csv: str = "instruments.csv") -> int:
-    df = pd.read_csv(instruments_csv)
+    df = load_instruments_df(instruments_csv)
     fut = df[
         (df["exchange"] == "NFO") &
         (df["segment"] == "NFO-FUT") &
         (df["name"] == "NIFTY")
     ].copy()
-    fut["expiry"] = pd.to_datetime(fut["expiry"], errors="coerce")
     fut = fut[fut["expiry"].dt.date >= datetime.now().date()].sort_values("expiry")
     if fut.empty:
         raise RuntimeError("No active NIFTY futures found.")
     return int(fut.iloc[0]["instrument_token"])
 
 def fetch_historical_in_chunks(kite, token: int, from_dt: datetime, to_dt: datetime, interval="5minute"):
-    all_rows = []
+    """
+    Fetch candles chunk by chunk and return a list of per-chunk DataFrames.
+    Typing each chunk as it arrives keeps memory bounded and skips the
+    row-of-dicts inference a single giant pd.DataFrame(...) would do.
+    """
+    windows = []
     chunk_start = from_dt
-
     while chunk_start < to_dt:
         chunk_end = min(chunk_start + timedelta(days=CHUNK_DAYS), to_dt)
+        windows.append((chunk_start, chunk_end))
+        # move forward a little to avoid overlap duplicates edge-case
+        chunk_start = chunk_end + timedelta(minutes=1)
+
+    if not windows:
+        return []
 
-        print(f"Fetching chunk: {chunk_start}  ->  {chunk_end}")
-        candles = kite.historical_data(
+    def _fetch(window):
+        start, end = window
+        return kite.historical_data(
             instrument_token=token,
-            from_date=chunk_start,
-            to_date=chunk_end,
+            from_date=start,
+            to_date=end,
             interval=interval,
             continuous=False,
             oi=False,
         )
 
-        if candles:
-            all_rows.extend(candles)
-            print(f"  received rows: {len(candles)}")
-        else:
-            print("  received rows: 0")
+    # the requests are pure network I/O, so a few threads overlap them;
+    # ex.map keeps results in window order
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(windows))) as ex:
+        results = list(ex.map(_fetch, windows))
 
-        # move forward a little to avoid overlap duplicates edge-case
-        chunk_start = chunk_end + timedelta(minutes=1)
+    frames = []
+    for (start, end), candles in zip(windows, results):
+        print(f"Fetched chunk: {start}  ->  {end}  | rows: {len(candles) if candles else 0}")
+        if candles:
+            frames.append(pd.DataFrame(candles))
 
-    return all_rows
+    return frames
 
 def main():
     kite = load_kite()
@@ -59,12 +95,12 @@ def main():
 
     print(f"Fetching 5m candles for token {token} from {from_dt} to {to_dt} (chunked)")
 
-    candles = fetch_historical_in_chunks(kite, token, from_dt, to_dt, interval="5minute")
+    frames = fetch_historical_in_chunks(kite, token, from_dt, to_dt, interval="5minute")
 
-    if not candles:
+    if not frames:
         raise RuntimeError("No candles returned.")
 
-    df = pd.DataFrame(candles)
+    df = pd.concat(frames, ignore_index=True)
     df["date"] = pd.to_datetime(df["date"])
     df = df.sort_values("date").drop_duplicates(subset=["date"]).reset_index(drop=True)
 
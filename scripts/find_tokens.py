@@ -1,9 +1,32 @@
 from pathlib import Path
 from datetime import date
+import numpy as np
 import pandas as pd
 
 CSV = Path(__file__).resolve().parent / "instruments.csv"
 
+def load_instruments_df(instruments_csv) -> pd.DataFrame:
+    """
+    Load the instrument dump, keeping a Parquet sibling as a typed cache
+    (expiry pre-parsed). The cache is rebuilt whenever the CSV is newer;
+    without a parquet engine installed this quietly stays on plain CSV.
+    """
+    csv_path = Path(instruments_csv)
+    cache = csv_path.with_suffix(".parquet")
+    try:
+        if cache.exists() and cache.stat().st_mtime >= csv_path.stat().st_mtime:
+            return pd.read_parquet(cache)
+    except Exception:
+        pass
+    df = pd.read_csv(csv_path)
+    if "expiry" in df.columns:
+        df["expiry"] = pd.to_datetime(df["expiry"], format="%Y-%m-%d", cache=True, errors="coerce")
+    try:
+        df.to_parquet(cache, index=False)
+    except Exception:
+        pass
+    return df
+
 def round_to_50(x: float) -> int:
     return int(round(x / 50.0) * 50)
 
@@ -14,24 +37,22 @@ def normalize_strike_series(s: pd.Series) -> pd.Series:
     - scaled (2250000.0)  -> divide by 100
     This function auto-detects and normalizes.
     """
-    s = pd.to_numeric(s, errors="coerce")
-    non_null = s.dropna()
-    if non_null.empty:
-        return s
+    arr = pd.to_numeric(s, errors="coerce").to_numpy(dtype=float)
 
-    median_val = non_null.median()
+    # nanmedian works straight off the float array — no dropna() copy needed
+    median_val = np.nanmedian(arr) if np.isfinite(arr).any() else np.nan
 
     # If strike values look too large (e.g., 2250000 instead of 22500), scale down by 100
-    if median_val > 100000:
-        s = s / 100.0
+    if np.isfinite(median_val) and median_val > 100000:
+        arr = arr / 100.0
 
-    return s
+    return pd.Series(arr, index=s.index)
 
 def main():
     if not CSV.exists():
         raise RuntimeError("instruments.csv not found. Run download_instruments.py first.")
 
-    df = pd.read_csv(CSV)
+    df = load_instruments_df(CSV)
 
     # --- 1) NIFTY near-month FUT ---
     fut = df[
@@ -40,7 +61,7 @@ def main():
         (df["name"] == "NIFTY")
     ].copy()
 
-    fut["expiry"] = pd.to_datetime(fut["expiry"], errors="coerce").dt.date
+    fut["expiry"] = fut["expiry"].dt.date
     fut = fut[fut["expiry"] >= date.today()].sort_values("expiry")
 
     if fut.empty:
@@ -59,7 +80,7 @@ def main():
     if opt.empty:
         raise RuntimeError("No NIFTY option rows found in instruments.csv")
 
-    opt["expiry"] = pd.to_datetime(opt["expiry"], errors="coerce").dt.date
+    opt["expiry"] = opt["expiry"].dt.date
     opt = opt[opt["expiry"] >= date.today()]
 
     if opt.empty:
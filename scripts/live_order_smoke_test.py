@@ -72,7 +72,7 @@ def pick_option_symbol(
     df = df[df["instrument_type"].astype(str).str.upper() == option_type.upper()]
     df["strike"] = pd.to_numeric(df["strike"], errors="coerce")
     df = df[df["strike"] == float(strike)]
-    df["expiry"] = pd.to_datetime(df["expiry"], errors="coerce")
+    df["expiry"] = pd.to_datetime(df["expiry"], format="%Y-%m-%d", cache=True, errors="coerce")
     df = df.dropna(subset=["expiry"])
     df = df[df["expiry"].dt.date >= date.today()]
     if df.empty: